@@ -192,7 +192,7 @@ def _create_task_folder(name: str, title: str, description: str) -> Path:
     return task_dir
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         description="Add a cron job with its own workspace folder",
         epilog="Run without arguments or with --help for a full tutorial.",
@@ -248,7 +248,7 @@ def main() -> None:
         help="Resource dependency (e.g. 'chrome_browser'). "
         "Jobs with same dependency run sequentially, different dependencies run in parallel.",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     missing = [p for p in ("name", "title", "description", "schedule") if not getattr(args, p)]
     if missing:
@@ -63,7 +63,7 @@ EXAMPLES:
 """
 
 
-def _parse_args() -> argparse.Namespace:
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Edit an existing cron job safely in place",
         epilog="Run without arguments for a full tutorial.",
@@ -105,7 +105,7 @@ def _parse_args() -> argparse.Namespace:
     enabled_group = parser.add_mutually_exclusive_group()
     enabled_group.add_argument("--enable", action="store_true", help="Enable the job")
     enabled_group.add_argument("--disable", action="store_true", help="Disable the job")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def _rename_task_folder(
@@ -227,8 +227,8 @@ def _apply_updates(args: argparse.Namespace, job: dict[str, Any]) -> tuple[list[
     return updated_fields, notes
 
 
-def main() -> None:
-    args = _parse_args()
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
 
     if not args.job_id:
         print(_TUTORIAL)
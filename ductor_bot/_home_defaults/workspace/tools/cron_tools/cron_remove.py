@@ -46,12 +46,13 @@ IMPORTANT:
 """
 
 
-def main() -> None:
-    if len(sys.argv) < 2 or not sys.argv[1].strip():
+def main(argv: list[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    if not args or not args[0].strip():
         print(_TUTORIAL)
         sys.exit(1)
 
-    job_id = sys.argv[1].strip()
+    job_id = args[0].strip()
 
     if not JOBS_PATH.exists():
         print(
@@ -54,6 +54,9 @@ class _StreamState:
 class CodexCLI(BaseCLI):
     """Async wrapper around the OpenAI Codex CLI."""
 
+    # Subprocess factory; a class attribute so tests can swap it per instance.
+    _spawn = staticmethod(asyncio.create_subprocess_exec)
+
     def __init__(self, config: CLIConfig) -> None:
         self._config = config
         self._working_dir = Path(config.working_dir).resolve()
@@ -159,7 +162,7 @@ class CodexCLI(BaseCLI):
         exec_cmd, use_cwd = docker_wrap(
             cmd, self._config.docker_container, self._config.chat_id, self._working_dir
         )
-        process = await asyncio.create_subprocess_exec(
+        process = await self._spawn(
             *exec_cmd,
             stdin=_win_stdin_pipe(),
             stdout=asyncio.subprocess.PIPE,
@@ -202,7 +205,7 @@ class CodexCLI(BaseCLI):
         exec_cmd, use_cwd = docker_wrap(
             cmd, self._config.docker_container, self._config.chat_id, self._working_dir
         )
-        process = await asyncio.create_subprocess_exec(
+        process = await self._spawn(
             *exec_cmd,
             stdin=_win_stdin_pipe(),
             stdout=asyncio.subprocess.PIPE,
@@ -24,7 +24,7 @@ class TaskOverrides:
     cli_parameters: list[str] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TaskExecutionConfig:
     """Resolved configuration for a single CLI execution."""
 
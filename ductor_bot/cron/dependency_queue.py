@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
@@ -30,9 +31,10 @@ class DependencyQueue:
 
     def __init__(self) -> None:
         self._locks: dict[str, asyncio.Lock] = {}
+        # Names of self._locks kept sorted on insert for get_all_dependencies().
+        self._dependency_names: list[str] = []
         self._queues: dict[str, list[_QueuedTask]] = {}
         self._active: dict[str, str] = {}
-        self._state_lock = asyncio.Lock()
 
     @asynccontextmanager
     async def acquire(
@@ -53,11 +55,11 @@ class DependencyQueue:
             yield
             return
 
-        lock = await self._get_or_create_lock(dependency)
-        await self._enqueue_task(task_id, task_label, dependency)
+        lock = self._get_or_create_lock(dependency)
+        self._enqueue_task(task_id, task_label, dependency)
 
         async with lock:
-            await self._mark_active(dependency, task_id, task_label)
+            self._mark_active(dependency, task_id, task_label)
             try:
                 logger.info(
                     "Task acquired dependency: task=%s dependency=%s",
@@ -66,74 +68,72 @@ class DependencyQueue:
                 )
                 yield
             finally:
-                await self._mark_released(dependency, task_id, task_label)
-
-    async def _get_or_create_lock(self, dependency: str) -> asyncio.Lock:
-        async with self._state_lock:
-            if dependency not in self._locks:
-                self._locks[dependency] = asyncio.Lock()
-                logger.debug("Created lock for dependency: %s", dependency)
-            return self._locks[dependency]
-
-    async def _enqueue_task(self, task_id: str, task_label: str, dependency: str) -> None:
-        async with self._state_lock:
-            if dependency not in self._queues:
-                self._queues[dependency] = []
-
-            queued_task = _QueuedTask(
+                self._mark_released(dependency, task_id, task_label)
+
+    # The bookkeeping helpers below never await, so on the event loop they run
+    # atomically with respect to other tasks and need no lock of their own.
+    # FIFO ordering between tasks comes from the per-dependency asyncio.Lock.
+
+    def _get_or_create_lock(self, dependency: str) -> asyncio.Lock:
+        lock = self._locks.get(dependency)
+        if lock is None:
+            lock = self._locks[dependency] = asyncio.Lock()
+            bisect.insort(self._dependency_names, dependency)
+            logger.debug("Created lock for dependency: %s", dependency)
+        return lock
+
+    def _enqueue_task(self, task_id: str, task_label: str, dependency: str) -> None:
+        queue = self._queues.setdefault(dependency, [])
+        queue.append(
+            _QueuedTask(
                 task_id=task_id,
                 task_label=task_label,
                 dependency=dependency,
             )
-            self._queues[dependency].append(queued_task)
-
-            position = len(self._queues[dependency])
-            active_task = self._active.get(dependency, "?")
-            logger.info(
-                "Task queued: task=%s dependency=%s position=%d active=%s",
-                task_label,
-                dependency,
-                position,
-                active_task,
-            )
-
-    async def _mark_active(self, dependency: str, task_id: str, task_label: str) -> None:
-        async with self._state_lock:
-            queue = self._queues.get(dependency, [])
-            # Remove only the first matching entry so that if two tasks share
-            # the same task_id (possible after a rapid reschedule), the second
-            # one is not inadvertently evicted from the queue.
-            new_queue: list[_QueuedTask] = []
-            removed = False
-            for t in queue:
-                if not removed and t.task_id == task_id:
-                    removed = True
-                else:
-                    new_queue.append(t)
-            if new_queue:
-                self._queues[dependency] = new_queue
+        )
+        logger.info(
+            "Task queued: task=%s dependency=%s position=%d active=%s",
+            task_label,
+            dependency,
+            len(queue),
+            self._active.get(dependency, "?"),
+        )
+
+    def _mark_active(self, dependency: str, task_id: str, task_label: str) -> None:
+        queue = self._queues.get(dependency, [])
+        # Remove only the first matching entry so that if two tasks share
+        # the same task_id (possible after a rapid reschedule), the second
+        # one is not inadvertently evicted from the queue.
+        new_queue: list[_QueuedTask] = []
+        removed = False
+        for t in queue:
+            if not removed and t.task_id == task_id:
+                removed = True
             else:
-                self._queues.pop(dependency, None)
-            self._active[dependency] = task_label
-
-    async def _mark_released(self, dependency: str, _task_id: str, task_label: str) -> None:
-        async with self._state_lock:
-            if self._active.get(dependency) == task_label:
-                self._active.pop(dependency, None)
-
-            remaining = len(self._queues.get(dependency, []))
-            logger.info(
-                "Task released dependency: task=%s dependency=%s remaining_queue=%d",
-                task_label,
-                dependency,
-                remaining,
-            )
+                new_queue.append(t)
+        if new_queue:
+            self._queues[dependency] = new_queue
+        else:
+            self._queues.pop(dependency, None)
+        self._active[dependency] = task_label
+
+    def _mark_released(self, dependency: str, _task_id: str, task_label: str) -> None:
+        if self._active.get(dependency) == task_label:
+            self._active.pop(dependency, None)
+
+        logger.info(
+            "Task released dependency: task=%s dependency=%s remaining_queue=%d",
+            task_label,
+            dependency,
+            len(self._queues.get(dependency, [])),
+        )
 
     def get_queue_info(self, dependency: str) -> dict[str, object]:
         """Get current queue status for a dependency (diagnostics)."""
+        lock = self._locks.get(dependency)
         return {
             "dependency": dependency,
-            "locked": self._locks.get(dependency, asyncio.Lock()).locked(),
+            "locked": lock is not None and lock.locked(),
             "active_task": self._active.get(dependency),
             "queue_length": len(self._queues.get(dependency, [])),
             "queued_tasks": [
@@ -148,7 +148,8 @@ class DependencyQueue:
 
     def get_all_dependencies(self) -> list[str]:
         """Return all known dependency names."""
-        return sorted(set(self._locks.keys()) | set(self._queues.keys()))
+        # Every queued dependency already has a lock, so the lock names cover all.
+        return list(self._dependency_names)
 
 
 _dependency_queue: DependencyQueue | None = None
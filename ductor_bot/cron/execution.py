@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 from shutil import which
 from typing import TYPE_CHECKING
 
@@ -14,6 +15,16 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Resolved CLI paths keyed by (binary, $PATH). Only hits are stored, so a CLI
+# installed while the bot is running is still found on the next cron run.
+_cli_paths: dict[tuple[str, str], str] = {}
+
+# Fixed parts of the one-shot commands; build_cmd only fills in the per-task values.
+_CLAUDE_ONESHOT_FLAGS = ("-p", "--output-format", "json")
+_CODEX_EXEC_FLAGS = ("exec", "--json", "--color", "never", "--skip-git-repo-check")
+_CODEX_BYPASS_FLAG = "--dangerously-bypass-approvals-and-sandbox"
+_CODEX_FULL_AUTO_FLAG = "--full-auto"
+
 
 def build_cmd(exec_config: TaskExecutionConfig, prompt: str) -> list[str] | None:
     """Build a CLI command for one-shot cron execution."""
@@ -40,6 +51,9 @@ def parse_claude_result(stdout: bytes) -> str:
     raw = stdout.decode(errors="replace").strip()
     if not raw:
         return ""
+    # The result envelope is a JSON object; anything else is plain CLI output.
+    if not raw.startswith("{"):
+        return raw[:2000]
     try:
         data = json.loads(raw)
         return str(data.get("result", ""))
@@ -59,56 +73,67 @@ def parse_codex_result(stdout: bytes) -> str:
 
 
 def indent(text: str, prefix: str) -> str:
-    """Indent every line of *text* with *prefix*."""
-    return "\n".join(prefix + line for line in text.splitlines())
+    """Indent every line of *text* with *prefix* (trailing newlines are dropped)."""
+    text = text.rstrip("\n")
+    if not text:
+        return ""
+    return prefix + text.replace("\n", "\n" + prefix)
 
 
 # -- Private builders --
 
 
+def _find_cli(name: str) -> str | None:
+    """Return the path of CLI *name*, caching successful ``which`` lookups."""
+    key = (name, os.environ.get("PATH", ""))
+    cli = _cli_paths.get(key)
+    if cli is None:
+        cli = which(name)
+        if cli:
+            _cli_paths[key] = cli
+    return cli
+
+
 def _build_claude_cmd(exec_config: TaskExecutionConfig, prompt: str) -> list[str] | None:
     """Build a Claude CLI command for one-shot cron execution."""
-    cli = which("claude")
+    cli = _find_cli("claude")
     if not cli:
         return None
-    cmd = [
+    return [
         cli,
-        "-p",
-        "--output-format",
-        "json",
+        *_CLAUDE_ONESHOT_FLAGS,
         "--model",
         exec_config.model,
         "--permission-mode",
         exec_config.permission_mode,
         "--no-session-persistence",
+        *exec_config.cli_parameters,
+        "--",
+        prompt,
     ]
-    # Add extra CLI parameters
-    cmd.extend(exec_config.cli_parameters)
-    cmd += ["--", prompt]
-    return cmd
 
 
 def _build_codex_cmd(exec_config: TaskExecutionConfig, prompt: str) -> list[str] | None:
     """Build a Codex CLI command for one-shot cron execution."""
-    cli = which("codex")
+    cli = _find_cli("codex")
     if not cli:
         return None
-    cmd = [cli, "exec", "--json", "--color", "never", "--skip-git-repo-check"]
-
-    # Sandbox flags based on permission_mode
-    if exec_config.permission_mode == "bypassPermissions":
-        cmd.append("--dangerously-bypass-approvals-and-sandbox")
-    else:
-        cmd.append("--full-auto")
-
-    cmd += ["--model", exec_config.model]
-
-    # Add reasoning effort (if not default)
-    if exec_config.reasoning_effort and exec_config.reasoning_effort != "medium":
-        cmd += ["-c", f"model_reasoning_effort={exec_config.reasoning_effort}"]
-
-    # Add extra CLI parameters
-    cmd.extend(exec_config.cli_parameters)
-
-    cmd += ["--", prompt]
-    return cmd
+    sandbox = (
+        _CODEX_BYPASS_FLAG
+        if exec_config.permission_mode == "bypassPermissions"
+        else _CODEX_FULL_AUTO_FLAG
+    )
+    # Reasoning effort is only passed when it differs from the Codex default
+    effort = exec_config.reasoning_effort
+    reasoning = ("-c", f"model_reasoning_effort={effort}") if effort and effort != "medium" else ()
+    return [
+        cli,
+        *_CODEX_EXEC_FLAGS,
+        sandbox,
+        "--model",
+        exec_config.model,
+        *reasoning,
+        *exec_config.cli_parameters,
+        "--",
+        prompt,
+    ]
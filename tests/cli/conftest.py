@@ -0,0 +1,83 @@
+"""Shared fixtures for CLI tests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+from pytest_asyncio import is_async_test
+
+from ductor_bot.cli import service
+from ductor_bot.cli.base import BaseCLI
+from ductor_bot.cli.process_registry import ProcessRegistry
+from ductor_bot.cli.service import CLIService, CLIServiceConfig
+from ductor_bot.config import ModelRegistry
+
+_PROVIDERS_CLAUDE = frozenset({"claude"})
+
+_CLI_TESTS = Path(__file__).parent
+# Async CLI tests await everything they start, so a module shares one event loop.
+_MODULE_LOOP = pytest.mark.asyncio(loop_scope="module")
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Run every async test under tests/cli on its module's event loop."""
+    for item in items:
+        if is_async_test(item) and item.path.is_relative_to(_CLI_TESTS):
+            item.add_marker(_MODULE_LOOP, append=False)
+
+
+def flag_values(cmd: list[str]) -> dict[str, str]:
+    """Map each flag in *cmd* to the token after it (first occurrence wins)."""
+    out: dict[str, str] = {}
+    for flag, value in pairwise(cmd):
+        if flag.startswith("-"):
+            out.setdefault(flag, value)
+    return out
+
+
+@pytest.fixture(scope="session")
+def base_models() -> ModelRegistry:
+    """ModelRegistry holds no state, so one instance serves every test."""
+    return ModelRegistry()
+
+
+@pytest.fixture
+def make_service(base_models: ModelRegistry, tmp_path: Path) -> Callable[..., CLIService]:
+    """Return a builder for CLIService with claude/opus defaults rooted at tmp_path."""
+
+    def _make(**overrides: Any) -> CLIService:
+        config = CLIServiceConfig(
+            working_dir=str(tmp_path),
+            default_model=overrides.pop("default_model", "opus"),
+            provider=overrides.pop("provider", "claude"),
+            max_turns=overrides.pop("max_turns", None),
+            max_budget_usd=overrides.pop("max_budget_usd", None),
+            permission_mode=overrides.pop("permission_mode", "bypassPermissions"),
+        )
+        return CLIService(
+            config=config,
+            models=base_models,
+            available_providers=overrides.pop("available_providers", _PROVIDERS_CLAUDE),
+            process_registry=ProcessRegistry(),
+        )
+
+    return _make
+
+
+@pytest.fixture
+def cli_mock() -> Any:
+    """BaseCLI autospec: ``send`` is async, ``send_streaming`` sync, unknown attrs raise."""
+    return create_autospec(BaseCLI, instance=True, spec_set=True)
+
+
+@pytest.fixture
+def patched_create_cli(monkeypatch: pytest.MonkeyPatch, cli_mock: Any) -> MagicMock:
+    """Replace ``service.create_cli`` with a mock that returns ``cli_mock``."""
+    create_cli = MagicMock(return_value=cli_mock)
+    monkeypatch.setattr(service, "create_cli", create_cli)
+    return create_cli
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import functools
 import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
 
 from ductor_bot.cli.codex_events import parse_codex_jsonl, parse_codex_stream_event
 from ductor_bot.cli.stream_events import (
     AssistantTextDelta,
     ResultEvent,
+    StreamEvent,
     SystemInitEvent,
     ThinkingEvent,
     ToolUseEvent,
@@ -88,116 +94,94 @@ def test_unparseable_lines_skipped() -> None:
 
 
 # -- parse_codex_stream_event (single line) --
+#
+# Parametrized lines are serialized once at collection so test bodies only parse.
 
 
-def test_stream_empty_line() -> None:
-    assert parse_codex_stream_event("") == []
-    assert parse_codex_stream_event("   ") == []
-
-
-def test_stream_invalid_json() -> None:
-    assert parse_codex_stream_event("not json") == []
-
-
-def test_stream_thread_started() -> None:
-    line = json.dumps({"type": "thread.started", "thread_id": "th-abc"})
-    events = parse_codex_stream_event(line)
-    assert len(events) == 1
-    assert isinstance(events[0], SystemInitEvent)
-    assert events[0].session_id == "th-abc"
-
-
-def test_stream_turn_completed() -> None:
-    line = json.dumps(
-        {
-            "type": "turn.completed",
-            "usage": {"input_tokens": 200},
-        }
-    )
-    events = parse_codex_stream_event(line)
-    assert len(events) == 1
-    assert isinstance(events[0], ResultEvent)
-    assert events[0].usage["input_tokens"] == 200
-
-
-def test_stream_turn_failed() -> None:
-    line = json.dumps(
-        {
-            "type": "turn.failed",
-            "error": {"message": "Rate limited"},
-        }
-    )
-    events = parse_codex_stream_event(line)
-    assert len(events) == 1
-    assert isinstance(events[0], ResultEvent)
-    assert events[0].is_error is True
-    assert events[0].result == "Rate limited"
-
-
-def test_stream_agent_message() -> None:
-    line = json.dumps(
-        {
-            "type": "item.completed",
-            "item": {"type": "agent_message", "text": "Hello"},
-        }
-    )
-    events = parse_codex_stream_event(line)
-    assert len(events) == 1
-    assert isinstance(events[0], AssistantTextDelta)
-    assert events[0].text == "Hello"
-
-
-def test_stream_reasoning() -> None:
-    line = json.dumps(
-        {
-            "type": "item.started",
-            "item": {"type": "reasoning", "text": "Thinking..."},
-        }
-    )
-    events = parse_codex_stream_event(line)
-    assert len(events) == 1
-    assert isinstance(events[0], ThinkingEvent)
-
-
-def test_stream_command_execution() -> None:
-    line = json.dumps(
-        {
-            "type": "item.started",
-            "item": {"type": "command_execution"},
-        }
-    )
-    events = parse_codex_stream_event(line)
-    assert len(events) == 1
-    assert isinstance(events[0], ToolUseEvent)
-    assert events[0].tool_name == "Bash"
-
-
-def test_stream_file_change() -> None:
-    line = json.dumps(
-        {
-            "type": "item.started",
-            "item": {"type": "file_change"},
-        }
-    )
-    events = parse_codex_stream_event(line)
-    assert len(events) == 1
-    assert isinstance(events[0], ToolUseEvent)
-    assert events[0].tool_name == "Edit"
+@pytest.fixture(scope="module")
+def parse() -> Callable[[str], list[StreamEvent]]:
+    """Parse each distinct line once per module. Returned lists are shared: never mutate."""
+    return functools.cache(parse_codex_stream_event)
 
 
-def test_stream_mcp_tool_call() -> None:
-    line = json.dumps(
-        {
-            "type": "item.started",
-            "item": {"type": "mcp_tool_call", "name": "search_docs"},
-        }
-    )
-    events = parse_codex_stream_event(line)
+@pytest.mark.parametrize(
+    "line",
+    ["", "   ", "not json", json.dumps({"type": "something.else"})],
+    ids=["empty", "whitespace", "invalid_json", "unknown_type"],
+)
+def test_stream_returns_empty(parse: Callable[[str], list[StreamEvent]], line: str) -> None:
+    assert parse(line) == []
+
+
+@pytest.mark.parametrize(
+    ("line", "event_cls", "attrs"),
+    [
+        (
+            json.dumps({"type": "thread.started", "thread_id": "th-abc"}),
+            SystemInitEvent,
+            {"session_id": "th-abc"},
+        ),
+        (
+            json.dumps({"type": "turn.completed", "usage": {"input_tokens": 200}}),
+            ResultEvent,
+            {"usage": {"input_tokens": 200}},
+        ),
+        (
+            json.dumps({"type": "turn.failed", "error": {"message": "Rate limited"}}),
+            ResultEvent,
+            {"is_error": True, "result": "Rate limited"},
+        ),
+        (
+            json.dumps(
+                {"type": "item.completed", "item": {"type": "agent_message", "text": "Hello"}}
+            ),
+            AssistantTextDelta,
+            {"text": "Hello"},
+        ),
+        (
+            json.dumps(
+                {"type": "item.started", "item": {"type": "reasoning", "text": "Thinking..."}}
+            ),
+            ThinkingEvent,
+            {},
+        ),
+        (
+            json.dumps({"type": "item.started", "item": {"type": "command_execution"}}),
+            ToolUseEvent,
+            {"tool_name": "Bash"},
+        ),
+        (
+            json.dumps({"type": "item.started", "item": {"type": "file_change"}}),
+            ToolUseEvent,
+            {"tool_name": "Edit"},
+        ),
+        (
+            json.dumps(
+                {"type": "item.started", "item": {"type": "mcp_tool_call", "name": "search_docs"}}
+            ),
+            ToolUseEvent,
+            {"tool_name": "search_docs"},
+        ),
+    ],
+    ids=[
+        "thread_started",
+        "turn_completed",
+        "turn_failed",
+        "agent_message",
+        "reasoning",
+        "command_execution",
+        "file_change",
+        "mcp_tool_call",
+    ],
+)
+def test_stream_single_event(
+    parse: Callable[[str], list[StreamEvent]],
+    line: str,
+    event_cls: type[StreamEvent],
+    attrs: dict[str, Any],
+) -> None:
+    events = parse(line)
     assert len(events) == 1
-    assert isinstance(events[0], ToolUseEvent)
-    assert events[0].tool_name == "search_docs"
-
-
-def test_stream_unknown_type_returns_empty() -> None:
-    line = json.dumps({"type": "something.else"})
-    assert parse_codex_stream_event(line) == []
+    assert isinstance(events[0], event_cls)
+    for attr, value in attrs.items():
+        assert getattr(events[0], attr) == value, attr
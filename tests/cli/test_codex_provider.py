@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import asyncio
-import json
+import dataclasses
 import logging
-from collections.abc import AsyncGenerator
+import re
+from collections import deque
+from collections.abc import AsyncGenerator, Iterable, Iterator
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -23,69 +23,224 @@ from ductor_bot.cli.stream_events import (
     ThinkingEvent,
     ToolUseEvent,
 )
+from tests.cli.conftest import flag_values
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+_NO_CODEX_RE = re.compile("codex CLI not found")
+_NO_PIPES_RE = re.compile("without stdout/stderr")
+
+# Codex JSONL events, pre-encoded so tests feed them straight to the process stubs.
+_AGENT_MSG_OK = b'{"type":"item.completed","item":{"type":"agent_message","text":"OK"}}'
+_AGENT_MSG_DONE = b'{"type":"item.completed","item":{"type":"agent_message","text":"Done"}}'
+_AGENT_MSG_PARTIAL = b'{"type":"item.completed","item":{"type":"agent_message","text":"partial"}}'
+_AGENT_MSG_HI = b'{"type":"item.completed","item":{"type":"agent_message","text":"hi"}}'
+_AGENT_MSG_RESUMED = b'{"type":"item.completed","item":{"type":"agent_message","text":"Resumed"}}'
+_AGENT_MSG_STREAMED = b'{"type":"item.completed","item":{"type":"agent_message","text":"streamed"}}'
+_AGENT_MSG_RESULT_ONLY = (
+    b'{"type":"item.completed","item":{"type":"agent_message","text":"Result only"}}'
+)
+_AGENT_MSG_DOCKER_OK = (
+    b'{"type":"item.completed","item":{"type":"agent_message","text":"docker OK"}}'
+)
+_AGENT_MSG_NO_REG = b'{"type":"item.completed","item":{"type":"agent_message","text":"no-reg"}}'
+_AGENT_MSG_NO_REG_STREAM = (
+    b'{"type":"item.completed","item":{"type":"agent_message","text":"no-reg-stream"}}'
+)
+_ITEM_STARTED_COMMAND = b'{"type":"item.started","item":{"type":"command_execution"}}'
+
+# Multi-line stdout fixtures, frozen at import and shared read-only across tests.
+_LINES_FULL_SEQUENCE = (
+    b'{"type":"thread.started","thread_id":"th-stream-1"}',
+    b'{"type":"item.started","item":{"type":"agent_message","text":"Hello "}}',
+    b'{"type":"item.completed","item":{"type":"agent_message","text":"world!"}}',
+)
+_LINES_TWO_PARTS = (
+    b'{"type":"item.completed","item":{"type":"agent_message","text":"Part 1"}}',
+    b'{"type":"item.completed","item":{"type":"agent_message","text":"Part 2"}}',
+)
+_LINES_BLANKS = (b"", b"   ", _AGENT_MSG_OK)
+_LINES_TOOLS = (
+    _ITEM_STARTED_COMMAND,
+    b'{"type":"item.started","item":{"type":"file_change"}}',
+    _AGENT_MSG_DONE,
+)
+_LINES_THINKING = (
+    b'{"type":"item.started","item":{"type":"reasoning","text":"Let me think..."}}',
+    b'{"type":"item.completed","item":{"type":"agent_message","text":"Answer"}}',
+)
+_LINES_MALFORMED = (b"not valid json at all", b"{broken", _AGENT_MSG_OK)
+_LINES_RESULT_ONLY = (_ITEM_STARTED_COMMAND, _AGENT_MSG_RESULT_ONLY)
+_JSONL_SEND_OK = b"\n".join(
+    (
+        b'{"type":"thread.started","thread_id":"th-1"}',
+        _AGENT_MSG_DONE,
+        b'{"type":"turn.completed","usage":{"input_tokens":10,"output_tokens":5}}',
+    )
+)
+_JSONL_LOGGED = b"\n".join(
+    (
+        b'{"type":"thread.started","thread_id":"th-log"}',
+        b'{"type":"item.completed","item":{"type":"agent_message","text":"ok"}}',
+        b'{"type":"turn.completed","usage":{"input_tokens":1,"output_tokens":2}}',
+    )
+)
+
+
+# Shared base configs. CodexCLI never mutates its config, so tests derive
+# variants with dataclasses.replace instead of rebuilding every default.
+_CFG_CODEX = CLIConfig(provider="codex", model="gpt-5.2-codex")
+_CFG_DOCKER = dataclasses.replace(_CFG_CODEX, docker_container="sandbox-container")
+
+
+@pytest.fixture
+def registry() -> ProcessRegistry:
+    return ProcessRegistry()
+
+
+@pytest.fixture(scope="module")
+def _provider_log() -> Iterator[list[logging.LogRecord]]:
+    """Attach one record-collecting handler to the provider logger for the module."""
+    provider_logger = logging.getLogger("ductor_bot.cli.codex_provider")
+    records: list[logging.LogRecord] = []
+    handler = logging.Handler(logging.DEBUG)
+    handler.emit = records.append  # type: ignore[method-assign]
+    old_level = provider_logger.level
+    provider_logger.addHandler(handler)
+    provider_logger.setLevel(logging.DEBUG)
+    yield records
+    provider_logger.removeHandler(handler)
+    provider_logger.setLevel(old_level)
+
+
+@pytest.fixture
+def log_records(_provider_log: list[logging.LogRecord]) -> list[logging.LogRecord]:
+    _provider_log.clear()
+    return _provider_log
+
+
+def _log_text(records: list[logging.LogRecord]) -> str:
+    return "\n".join(record.getMessage() for record in records)
+
+
+class _CallCounter:
+    """Cheap stand-in for a sync mock whose calls are only counted."""
+
+    __slots__ = ("calls",)
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, *_args: object, **_kwargs: object) -> None:
+        self.calls += 1
+
+    def assert_called_once(self) -> None:
+        assert self.calls == 1, f"expected 1 call, got {self.calls}"
+
 
 def _make_cli(monkeypatch: pytest.MonkeyPatch, **overrides: Any) -> CodexCLI:
     monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    return CodexCLI(
-        CLIConfig(
-            provider="codex",
-            model=overrides.pop("model", "gpt-5.2-codex"),
-            **overrides,
-        )
-    )
+    return CodexCLI(dataclasses.replace(_CFG_CODEX, **overrides) if overrides else _CFG_CODEX)
 
 
-def _make_process_mock(
-    stdout: bytes = b"",
-    stderr: bytes = b"",
-    returncode: int = 0,
-) -> AsyncMock:
-    """Create an asyncio.subprocess.Process mock with communicate()."""
-    proc = AsyncMock(spec=asyncio.subprocess.Process)
-    proc.communicate.return_value = (stdout, stderr)
-    proc.returncode = returncode
-    proc.pid = 12345
-    proc.kill = MagicMock()
-    proc.wait = AsyncMock()
-    return proc
+class _FakeProcess:
+    """Hand-rolled stand-in for ``asyncio.subprocess.Process``."""
+
+    __slots__ = ("_output", "kill", "pid", "returncode", "stderr", "stdout")
+
+    def __init__(
+        self, returncode: int | None = 0, *, stdout: bytes = b"", stderr: bytes = b""
+    ) -> None:
+        self.returncode = returncode
+        self.pid = 12345
+        self.kill = _CallCounter()
+        self.stdout: Any = None
+        self.stderr: Any = None
+        self._output = (stdout, stderr)
+
+    async def communicate(self, input: bytes | None = None) -> tuple[bytes, bytes]:  # noqa: A002
+        return self._output
+
+    async def wait(self) -> int | None:
+        return self.returncode
+
+
+class _FakeStream:
+    """Stand-in for ``asyncio.StreamReader`` backed by a preloaded deque of chunks."""
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, chunks: Iterable[bytes] = ()) -> None:
+        self._chunks = deque(chunks)
+
+    async def readline(self) -> bytes:
+        return self._chunks.popleft() if self._chunks else b""
+
+    async def read(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _HangingProcess(_FakeProcess):
+    """Process whose ``communicate`` times out."""
+
+    __slots__ = ()
+
+    async def communicate(self, input: bytes | None = None) -> tuple[bytes, bytes]:  # noqa: A002
+        raise TimeoutError
+
+
+class _HangingStream(_FakeStream):
+    """Stream whose ``readline`` times out."""
+
+    __slots__ = ()
+
+    async def readline(self) -> bytes:
+        raise TimeoutError
 
 
 def _make_streaming_process(
-    lines: list[str],
+    lines: Iterable[bytes],
     stderr: bytes = b"",
     returncode: int = 0,
-) -> AsyncMock:
-    """Create a process mock that yields stdout lines one at a time."""
-    proc = AsyncMock(spec=asyncio.subprocess.Process)
-    proc.returncode = returncode
-    proc.pid = 12345
-    proc.kill = MagicMock()
-    proc.wait = AsyncMock()
-
-    # stdout readline mock: returns each line as bytes, then b""
-    encoded_lines = [line.encode() + b"\n" for line in lines] + [b""]
-    stdout_mock = AsyncMock()
-    stdout_mock.readline = AsyncMock(side_effect=encoded_lines)
-    proc.stdout = stdout_mock
-
-    # stderr mock
-    stderr_mock = AsyncMock()
-    stderr_mock.read = AsyncMock(return_value=stderr)
-    proc.stderr = stderr_mock
-
+) -> _FakeProcess:
+    """Create a process stub that yields stdout lines one at a time."""
+    proc = _FakeProcess(returncode)
+    proc.stdout = _FakeStream(line + b"\n" for line in lines)
+    proc.stderr = _FakeStream((stderr,))
     return proc
 
 
+_SpawnCall = tuple[tuple[Any, ...], dict[str, Any]]
+
+
+def _patch_spawn(
+    monkeypatch: pytest.MonkeyPatch, cli: CodexCLI, proc: _FakeProcess
+) -> list[_SpawnCall]:
+    """Make *cli* spawn *proc* instead of a real subprocess; return the recorded calls."""
+    calls: list[_SpawnCall] = []
+
+    async def spawn(*args: Any, **kwargs: Any) -> _FakeProcess:
+        calls.append((args, kwargs))
+        return proc
+
+    monkeypatch.setattr(cli, "_spawn", spawn)
+    return calls
+
+
 async def _collect_events(gen: AsyncGenerator[StreamEvent, None]) -> list[StreamEvent]:
     """Drain an async generator of StreamEvents into a list."""
     return [event async for event in gen]
 
 
+async def _collect_text(gen: AsyncGenerator[StreamEvent, None]) -> list[str]:
+    """Drain an async generator, keeping only AssistantTextDelta texts."""
+    return [event.text async for event in gen if isinstance(event, AssistantTextDelta)]
+
+
 # ---------------------------------------------------------------------------
 # __init__ / _find_cli
 # ---------------------------------------------------------------------------
@@ -94,22 +249,22 @@ async def _collect_events(gen: AsyncGenerator[StreamEvent, None]) -> list[Stream
 class TestInit:
     def test_find_cli_raises_when_not_on_path(self, monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: None)
-        with pytest.raises(FileNotFoundError, match="codex CLI not found"):
-            CodexCLI(CLIConfig(provider="codex"))
+        with pytest.raises(FileNotFoundError, match=_NO_CODEX_RE):
+            CodexCLI(_CFG_CODEX)
 
     def test_find_cli_uses_resolved_path(self, monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/opt/bin/codex")
-        cli = CodexCLI(CLIConfig(provider="codex"))
+        cli = CodexCLI(_CFG_CODEX)
         assert cli._cli == "/opt/bin/codex"
 
     def test_docker_container_skips_find_cli(self) -> None:
         """When docker_container is set, _find_cli is never called."""
-        cli = CodexCLI(CLIConfig(provider="codex", docker_container="my-sandbox"))
+        cli = CodexCLI(dataclasses.replace(_CFG_CODEX, docker_container="my-sandbox"))
         assert cli._cli == "codex"
 
     def test_working_dir_resolved(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-        cli = CodexCLI(CLIConfig(provider="codex", working_dir=str(tmp_path)))
+        cli = CodexCLI(dataclasses.replace(_CFG_CODEX, working_dir=str(tmp_path)))
         assert cli._working_dir == tmp_path.resolve()
 
 
@@ -178,13 +333,10 @@ class TestBuildCommand:
         assert cmd[0] == "/usr/bin/codex"
         assert cmd[1] == "exec"
         assert "--json" in cmd
-        assert "--color" in cmd
-        idx_color = cmd.index("--color")
-        assert cmd[idx_color + 1] == "never"
         assert "--skip-git-repo-check" in cmd
-        assert "--model" in cmd
-        idx_model = cmd.index("--model")
-        assert cmd[idx_model + 1] == "gpt-5.2-codex"
+        fv = flag_values(cmd)
+        assert fv["--color"] == "never"
+        assert fv["--model"] == "gpt-5.2-codex"
         assert cmd[-1] == "hello"
 
     def test_json_output_false(self, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -213,18 +365,14 @@ class TestBuildCommand:
         cli = _make_cli(monkeypatch, reasoning_effort=effort)
         cmd = cli._build_command("hello")
         if should_have_flag:
-            assert "-c" in cmd
-            idx = cmd.index("-c")
-            assert cmd[idx + 1] == f"model_reasoning_effort={effort}"
+            assert flag_values(cmd)["-c"] == f"model_reasoning_effort={effort}"
         else:
             assert "-c" not in cmd
 
     def test_instructions_flag(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch, instructions="/path/to/instructions.md")
         cmd = cli._build_command("hello")
-        assert "--instructions" in cmd
-        idx = cmd.index("--instructions")
-        assert cmd[idx + 1] == "/path/to/instructions.md"
+        assert flag_values(cmd)["--instructions"] == "/path/to/instructions.md"
 
     def test_no_instructions_omits_flag(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch, instructions=None)
@@ -234,10 +382,11 @@ class TestBuildCommand:
     def test_images_flags(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch, images=["img1.png", "img2.jpg"])
         cmd = cli._build_command("hello")
-        image_indices = [i for i, c in enumerate(cmd) if c == "--image"]
-        assert len(image_indices) == 2
-        assert cmd[image_indices[0] + 1] == "img1.png"
-        assert cmd[image_indices[1] + 1] == "img2.jpg"
+        assert cmd.count("--image") == 2
+        first = cmd.index("--image")
+        second = cmd.index("--image", first + 1)
+        assert cmd[first + 1] == "img1.png"
+        assert cmd[second + 1] == "img2.jpg"
 
     def test_resume_session_changes_structure(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch, permission_mode="bypassPermissions")
@@ -280,73 +429,52 @@ class TestBuildCommand:
 # ---------------------------------------------------------------------------
 
 
-class TestParseOutput:
-    def test_empty_stdout_returns_error(self) -> None:
-        resp = CodexCLI._parse_output(b"", b"", 0)
-        assert resp.is_error is True
-        assert resp.result == ""
+_JSONL_SUCCESS = (
+    b'{"type":"thread.started","thread_id":"th-42"}\n'
+    b'{"type":"item.completed","item":{"type":"agent_message","text":"Hello world"}}\n'
+    b'{"type":"turn.completed","usage":{"input_tokens":100,"output_tokens":50}}'
+)
 
-    def test_empty_stdout_with_stderr(self) -> None:
-        resp = CodexCLI._parse_output(b"", b"some error", 1)
-        assert resp.is_error is True
-        assert resp.stderr == "some error"
-        assert resp.returncode == 1
-
-    def test_successful_jsonl_output(self) -> None:
-        lines = "\n".join(
-            [
-                json.dumps({"type": "thread.started", "thread_id": "th-42"}),
-                json.dumps(
-                    {
-                        "type": "item.completed",
-                        "item": {"type": "agent_message", "text": "Hello world"},
-                    }
-                ),
-                json.dumps(
-                    {
-                        "type": "turn.completed",
-                        "usage": {"input_tokens": 100, "output_tokens": 50},
-                    }
-                ),
-            ]
-        )
-        resp = CodexCLI._parse_output(lines.encode(), b"", 0)
-        assert resp.is_error is False
-        assert resp.session_id == "th-42"
-        assert "Hello world" in resp.result
-        assert resp.usage["input_tokens"] == 100
-
-    def test_nonzero_returncode_marks_error(self) -> None:
-        line = json.dumps(
-            {
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": "partial"},
-            }
-        )
-        resp = CodexCLI._parse_output(line.encode(), b"", 1)
-        assert resp.is_error is True
-        assert "partial" in resp.result
-
-    def test_non_json_output_fallback_to_raw(self) -> None:
-        resp = CodexCLI._parse_output(b"plain text output", b"", 0)
-        # parse_codex_jsonl returns empty text for non-json, so fallback to raw
-        assert resp.result == "plain text output"
-        assert resp.is_error is True  # no result_text means is_error
-
-    def test_stderr_truncated_at_2000(self) -> None:
-        long_stderr = b"x" * 3000
-        resp = CodexCLI._parse_output(b"", long_stderr, 1)
-        assert len(resp.stderr) == 2000
-
-    def test_usage_empty_dict_when_none(self) -> None:
-        line = json.dumps(
-            {
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": "hi"},
-            }
-        )
-        resp = CodexCLI._parse_output(line.encode(), b"", 0)
-        assert resp.usage == {}
+
+class TestParseOutput:
+    @pytest.mark.parametrize(
+        ("stdout", "stderr", "returncode", "expected"),
+        [
+            (b"", b"", 0, {"is_error": True, "result": ""}),
+            (b"", b"some error", 1, {"is_error": True, "stderr": "some error", "returncode": 1}),
+            (
+                _JSONL_SUCCESS,
+                b"",
+                0,
+                {
+                    "is_error": False,
+                    "session_id": "th-42",
+                    "result": "Hello world",
+                    "usage": {"input_tokens": 100, "output_tokens": 50},
+                },
+            ),
+            (_AGENT_MSG_PARTIAL, b"", 1, {"is_error": True, "result": "partial"}),
+            # parse_codex_jsonl finds no text in non-JSON output: raw fallback, flagged as error
+            (b"plain text output", b"", 0, {"is_error": True, "result": "plain text output"}),
+            (b"", b"x" * 3000, 1, {"stderr": "x" * 2000}),
+            (_AGENT_MSG_HI, b"", 0, {"is_error": False, "usage": {}}),
+        ],
+        ids=[
+            "empty_stdout",
+            "empty_stdout_with_stderr",
+            "successful_jsonl",
+            "nonzero_returncode",
+            "non_json_fallback",
+            "stderr_truncated",
+            "usage_empty",
+        ],
+    )
+    def test_parse_output(
+        self, stdout: bytes, stderr: bytes, returncode: int, expected: dict[str, Any]
+    ) -> None:
+        resp = CodexCLI._parse_output(stdout, stderr, returncode)
+        for attr, value in expected.items():
+            assert getattr(resp, attr) == value, attr
 
 
 # ---------------------------------------------------------------------------
@@ -357,31 +485,10 @@ class TestParseOutput:
 class TestSend:
     async def test_send_success(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        jsonl = "\n".join(
-            [
-                json.dumps({"type": "thread.started", "thread_id": "th-1"}),
-                json.dumps(
-                    {
-                        "type": "item.completed",
-                        "item": {"type": "agent_message", "text": "Done"},
-                    }
-                ),
-                json.dumps(
-                    {
-                        "type": "turn.completed",
-                        "usage": {"input_tokens": 10, "output_tokens": 5},
-                    }
-                ),
-            ]
-        )
-        proc = _make_process_mock(stdout=jsonl.encode(), returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-
-            resp = await cli.send("hello", timeout_seconds=30.0)
+        proc = _FakeProcess(stdout=_JSONL_SEND_OK)
+
+        _patch_spawn(monkeypatch, cli, proc)
+        resp = await cli.send("hello", timeout_seconds=30.0)
 
         assert resp.is_error is False
         assert resp.session_id == "th-1"
@@ -390,39 +497,24 @@ class TestSend:
     async def test_send_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
 
-        proc = _make_process_mock()
-        proc.communicate = AsyncMock(side_effect=TimeoutError)
-        proc.returncode = None
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
+        proc = _HangingProcess(None)
 
-            resp = await cli.send("hello", timeout_seconds=0.001)
+        _patch_spawn(monkeypatch, cli, proc)
+        resp = await cli.send("hello", timeout_seconds=0.001)
 
         assert resp.is_error is True
         assert resp.timed_out is True
         proc.kill.assert_called_once()
 
-    async def test_send_with_process_registry(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        registry = ProcessRegistry()
+    async def test_send_with_process_registry(
+        self, monkeypatch: pytest.MonkeyPatch, registry: ProcessRegistry
+    ) -> None:
         cli = _make_cli(monkeypatch, process_registry=registry, chat_id=42)
 
-        jsonl = json.dumps(
-            {
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": "OK"},
-            }
-        )
-        proc = _make_process_mock(stdout=jsonl.encode(), returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
+        proc = _FakeProcess(stdout=_AGENT_MSG_OK)
 
-            resp = await cli.send("hello")
+        _patch_spawn(monkeypatch, cli, proc)
+        resp = await cli.send("hello")
 
         assert resp.result == "OK"
         # After send completes, process should be unregistered
@@ -431,58 +523,31 @@ class TestSend:
     async def test_send_continue_session_ignored(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """continue_session=True is a no-op for Codex (logs debug but works)."""
         cli = _make_cli(monkeypatch)
-        jsonl = json.dumps(
-            {
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": "OK"},
-            }
-        )
-        proc = _make_process_mock(stdout=jsonl.encode(), returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
+        proc = _FakeProcess(stdout=_AGENT_MSG_OK)
 
-            resp = await cli.send("hello", continue_session=True)
+        _patch_spawn(monkeypatch, cli, proc)
+        resp = await cli.send("hello", continue_session=True)
 
         assert resp.result == "OK"
 
     async def test_send_with_resume_session(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        jsonl = json.dumps(
-            {
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": "Resumed"},
-            }
-        )
-        proc = _make_process_mock(stdout=jsonl.encode(), returncode=0)
+        proc = _FakeProcess(stdout=_AGENT_MSG_RESUMED)
 
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-
-            resp = await cli.send("hello", resume_session="thread-xyz")
+        _patch_spawn(monkeypatch, cli, proc)
+        resp = await cli.send("hello", resume_session="thread-xyz")
 
         assert "Resumed" in resp.result
 
     async def test_send_registry_unregisters_on_timeout(
-        self, monkeypatch: pytest.MonkeyPatch
+        self, monkeypatch: pytest.MonkeyPatch, registry: ProcessRegistry
     ) -> None:
-        registry = ProcessRegistry()
         cli = _make_cli(monkeypatch, process_registry=registry, chat_id=99)
 
-        proc = _make_process_mock()
-        proc.communicate = AsyncMock(side_effect=TimeoutError)
-        proc.returncode = None
+        proc = _HangingProcess(None)
 
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-
-            resp = await cli.send("hello", timeout_seconds=0.001)
+        _patch_spawn(monkeypatch, cli, proc)
+        resp = await cli.send("hello", timeout_seconds=0.001)
 
         assert resp.timed_out is True
         # Process should still be unregistered via finally block
@@ -497,30 +562,10 @@ class TestSend:
 class TestSendStreaming:
     async def test_streaming_full_sequence(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        lines = [
-            json.dumps({"type": "thread.started", "thread_id": "th-stream-1"}),
-            json.dumps(
-                {
-                    "type": "item.started",
-                    "item": {"type": "agent_message", "text": "Hello "},
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "world!"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process(_LINES_FULL_SEQUENCE, returncode=0)
 
-            events = await _collect_events(cli.send_streaming("hello"))
+        _patch_spawn(monkeypatch, cli, proc)
+        events = await _collect_events(cli.send_streaming("hello"))
 
         # item.started text is skipped (only item.completed emits text).
         # Thinking filter buffers text and flushes at stream end.
@@ -539,28 +584,13 @@ class TestSendStreaming:
     async def test_streaming_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
 
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.returncode = None
-        proc.pid = 12345
-        proc.kill = MagicMock()
-        proc.wait = AsyncMock()
-
-        stdout_mock = AsyncMock()
+        proc = _FakeProcess(None)
         # Simulate a read that never completes by raising TimeoutError
-        stdout_mock.readline = AsyncMock(side_effect=TimeoutError)
-        proc.stdout = stdout_mock
-
-        stderr_mock = AsyncMock()
-        stderr_mock.read = AsyncMock(return_value=b"")
-        proc.stderr = stderr_mock
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc.stdout = _HangingStream()
+        proc.stderr = _FakeStream()
 
-            events = await _collect_events(cli.send_streaming("hello", timeout_seconds=0.01))
+        _patch_spawn(monkeypatch, cli, proc)
+        events = await _collect_events(cli.send_streaming("hello", timeout_seconds=0.01))
 
         result_events = [e for e in events if isinstance(e, ResultEvent)]
         assert len(result_events) == 1
@@ -572,43 +602,18 @@ class TestSendStreaming:
     ) -> None:
         cli = _make_cli(monkeypatch)
 
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.stdout = None
-        proc.stderr = None
+        proc = _FakeProcess()
 
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-
-            with pytest.raises(RuntimeError, match="without stdout/stderr"):
-                await _collect_events(cli.send_streaming("hello"))
+        _patch_spawn(monkeypatch, cli, proc)
+        with pytest.raises(RuntimeError, match=_NO_PIPES_RE):
+            await _collect_events(cli.send_streaming("hello"))
 
     async def test_streaming_accumulates_text(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        lines = [
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "Part 1"},
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "Part 2"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process(_LINES_TWO_PARTS, returncode=0)
 
-            events = await _collect_events(cli.send_streaming("hello"))
+        _patch_spawn(monkeypatch, cli, proc)
+        events = await _collect_events(cli.send_streaming("hello"))
 
         result_events = [e for e in events if isinstance(e, ResultEvent)]
         assert len(result_events) == 1
@@ -617,61 +622,17 @@ class TestSendStreaming:
 
     async def test_streaming_empty_lines_skipped(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        lines = [
-            "",
-            "   ",
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "OK"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process(_LINES_BLANKS, returncode=0)
 
-            events = await _collect_events(cli.send_streaming("hello"))
-
-        text_events = [e for e in events if isinstance(e, AssistantTextDelta)]
-        assert len(text_events) == 1
-        assert text_events[0].text == "OK"
+        _patch_spawn(monkeypatch, cli, proc)
+        assert await _collect_text(cli.send_streaming("hello")) == ["OK"]
 
     async def test_streaming_with_tool_events(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        lines = [
-            json.dumps(
-                {
-                    "type": "item.started",
-                    "item": {"type": "command_execution"},
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "item.started",
-                    "item": {"type": "file_change"},
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "Done"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process(_LINES_TOOLS, returncode=0)
 
-            events = await _collect_events(cli.send_streaming("hello"))
+        _patch_spawn(monkeypatch, cli, proc)
+        events = await _collect_events(cli.send_streaming("hello"))
 
         tool_events = [e for e in events if isinstance(e, ToolUseEvent)]
         assert len(tool_events) == 2
@@ -680,29 +641,10 @@ class TestSendStreaming:
 
     async def test_streaming_with_thinking_events(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        lines = [
-            json.dumps(
-                {
-                    "type": "item.started",
-                    "item": {"type": "reasoning", "text": "Let me think..."},
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "Answer"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process(_LINES_THINKING, returncode=0)
 
-            events = await _collect_events(cli.send_streaming("hello"))
+        _patch_spawn(monkeypatch, cli, proc)
+        events = await _collect_events(cli.send_streaming("hello"))
 
         # ThinkingEvent passes through for [THINKING] display
         thinking_events = [e for e in events if isinstance(e, ThinkingEvent)]
@@ -716,76 +658,32 @@ class TestSendStreaming:
 
     async def test_streaming_process_error_exit_code(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        lines = [
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "partial"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, stderr=b"fatal error", returncode=1)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process((_AGENT_MSG_PARTIAL,), stderr=b"fatal error", returncode=1)
 
-            events = await _collect_events(cli.send_streaming("hello"))
+        _patch_spawn(monkeypatch, cli, proc)
+        events = await _collect_events(cli.send_streaming("hello"))
 
         result_events = [e for e in events if isinstance(e, ResultEvent)]
         assert len(result_events) == 1
         assert result_events[0].is_error is True
 
-    async def test_streaming_registry_cleanup(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        registry = ProcessRegistry()
+    async def test_streaming_registry_cleanup(
+        self, monkeypatch: pytest.MonkeyPatch, registry: ProcessRegistry
+    ) -> None:
         cli = _make_cli(monkeypatch, process_registry=registry, chat_id=77)
-        lines = [
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "OK"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
+        proc = _make_streaming_process((_AGENT_MSG_OK,), returncode=0)
 
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
-
-            await _collect_events(cli.send_streaming("hello"))
+        _patch_spawn(monkeypatch, cli, proc)
+        await _collect_events(cli.send_streaming("hello"))
 
         assert not registry.has_active(77)
 
     async def test_streaming_malformed_json_skipped(self, monkeypatch: pytest.MonkeyPatch) -> None:
         cli = _make_cli(monkeypatch)
-        lines = [
-            "not valid json at all",
-            "{broken",
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "OK"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process(_LINES_MALFORMED, returncode=0)
 
-            events = await _collect_events(cli.send_streaming("hello"))
-
-        text_events = [e for e in events if isinstance(e, AssistantTextDelta)]
-        assert len(text_events) == 1
-        assert text_events[0].text == "OK"
+        _patch_spawn(monkeypatch, cli, proc)
+        assert await _collect_text(cli.send_streaming("hello")) == ["OK"]
 
 
 # ---------------------------------------------------------------------------
@@ -793,74 +691,48 @@ class TestSendStreaming:
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture
+def finished_proc() -> _FakeProcess:
+    return _FakeProcess()
+
+
 class TestCodexFinalResult:
-    async def test_success_with_text(self) -> None:
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.returncode = 0
-        proc.wait = AsyncMock()
-
-        result = await _codex_final_result(proc, ["Hello", "World"], "th-42")
-        assert result.is_error is False
-        assert result.result == "Hello\nWorld"
-        assert result.session_id == "th-42"
-
-    async def test_success_empty_text(self) -> None:
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.returncode = 0
-        proc.wait = AsyncMock()
-
-        result = await _codex_final_result(proc, [], None)
-        assert result.is_error is False
-        assert result.result == ""
-        assert result.session_id is None
-
-    async def test_error_with_stderr(self) -> None:
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.returncode = 1
-        proc.wait = AsyncMock()
-
-        result = await _codex_final_result(proc, ["partial"], None, b"fatal error")
-        assert result.is_error is True
-        assert "fatal error" in result.result
-
-    async def test_error_no_stderr_uses_accumulated(self) -> None:
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.returncode = 1
-        proc.wait = AsyncMock()
-
-        result = await _codex_final_result(proc, ["error msg"], None, b"")
-        assert result.is_error is True
-        assert "error msg" in result.result
-
-    async def test_error_no_output_at_all(self) -> None:
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.returncode = 1
-        proc.wait = AsyncMock()
-
-        result = await _codex_final_result(proc, [], None, b"")
-        assert result.is_error is True
-        assert result.result == "(no output)"
-
-    async def test_error_result_truncated_at_500(self) -> None:
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.returncode = 1
-        proc.wait = AsyncMock()
-
-        long_stderr = ("x" * 600).encode()
-        result = await _codex_final_result(proc, [], None, long_stderr)
-        assert result.is_error is True
-        assert len(result.result) <= 500
-
-    async def test_stderr_bytes_truncated_at_2000(self) -> None:
-        proc = AsyncMock(spec=asyncio.subprocess.Process)
-        proc.returncode = 1
-        proc.wait = AsyncMock()
-
-        long_stderr = b"y" * 3000
-        result = await _codex_final_result(proc, [], None, long_stderr)
-        # The error_detail uses stderr_text which is truncated at 2000
-        # then the result is further truncated at 500
-        assert result.is_error is True
+    @pytest.mark.parametrize(
+        ("returncode", "args", "is_error", "expected"),
+        [
+            (0, (["Hello", "World"], "th-42", b""), False, "Hello\nWorld"),
+            (0, ([], None, b""), False, ""),
+            (1, (["partial"], None, b"fatal error"), True, "fatal error"),
+            (1, (["error msg"], None, b""), True, "error msg"),
+            (1, ([], None, b""), True, "(no output)"),
+            (1, ([], None, b"x" * 600), True, "x" * 500),
+            # stderr is cut to 2000 chars before the result is cut to 500
+            (1, ([], None, b"y" * 3000), True, "y" * 500),
+        ],
+        ids=[
+            "success_text",
+            "success_empty",
+            "error_stderr",
+            "error_accumulated",
+            "error_no_output",
+            "error_truncated_500",
+            "error_stderr_truncated_2000",
+        ],
+    )
+    async def test_final_result(
+        self,
+        finished_proc: _FakeProcess,
+        returncode: int,
+        args: tuple[list[str], str | None, bytes],
+        is_error: bool,
+        expected: str,
+    ) -> None:
+        finished_proc.returncode = returncode
+        texts, thread_id, stderr = args
+        result = await _codex_final_result(finished_proc, texts, thread_id, stderr)
+        assert result.is_error is is_error
+        assert result.result == expected
+        assert result.session_id == (None if is_error else thread_id)
 
 
 # ---------------------------------------------------------------------------
@@ -869,26 +741,25 @@ class TestCodexFinalResult:
 
 
 class TestLogCmd:
-    def test_short_values_not_truncated(self, caplog: pytest.LogCaptureFixture) -> None:
-        with caplog.at_level(logging.INFO, logger="ductor_bot.cli.codex_provider"):
-            _log_cmd(["codex", "exec", "--json", "short prompt"])
-        assert "short prompt" in caplog.text
-
-    def test_long_values_truncated(self, caplog: pytest.LogCaptureFixture) -> None:
-        long_val = "x" * 100
-        with caplog.at_level(logging.INFO, logger="ductor_bot.cli.codex_provider"):
-            _log_cmd(["codex", "exec", long_val])
-        assert "..." in caplog.text
-
-    def test_streaming_prefix(self, caplog: pytest.LogCaptureFixture) -> None:
-        with caplog.at_level(logging.INFO, logger="ductor_bot.cli.codex_provider"):
-            _log_cmd(["codex", "exec"], streaming=True)
-        assert "Codex stream cmd" in caplog.text
-
-    def test_non_streaming_prefix(self, caplog: pytest.LogCaptureFixture) -> None:
-        with caplog.at_level(logging.INFO, logger="ductor_bot.cli.codex_provider"):
-            _log_cmd(["codex", "exec"], streaming=False)
-        assert "Codex cmd" in caplog.text
+    @pytest.mark.parametrize(
+        ("argv", "streaming", "must_contain"),
+        [
+            (["codex", "exec", "--json", "short prompt"], False, "short prompt"),
+            (["codex", "exec", "x" * 100], False, "..."),
+            (["codex", "exec"], True, "Codex stream cmd"),
+            (["codex", "exec"], False, "Codex cmd"),
+        ],
+        ids=["short_not_truncated", "long_truncated", "streaming_prefix", "non_streaming_prefix"],
+    )
+    def test_log_cmd(
+        self,
+        log_records: list[logging.LogRecord],
+        argv: list[str],
+        streaming: bool,
+        must_contain: str,
+    ) -> None:
+        _log_cmd(argv, streaming=streaming)
+        assert must_contain in _log_text(log_records)
 
 
 # ---------------------------------------------------------------------------
@@ -899,35 +770,18 @@ class TestLogCmd:
 class TestDockerIntegration:
     async def test_send_with_docker_container(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """When docker_container is set, command is wrapped in docker exec."""
-        cli = CodexCLI(
-            CLIConfig(
-                provider="codex",
-                model="gpt-5.2-codex",
-                docker_container="sandbox-container",
-            )
-        )
-        jsonl = json.dumps(
-            {
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": "docker OK"},
-            }
-        )
-        proc = _make_process_mock(stdout=jsonl.encode(), returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-
-            resp = await cli.send("hello")
+        cli = CodexCLI(_CFG_DOCKER)
+        proc = _FakeProcess(stdout=_AGENT_MSG_DOCKER_OK)
+
+        calls = _patch_spawn(monkeypatch, cli, proc)
+        resp = await cli.send("hello")
 
         # Verify docker exec was called
-        call_args = mock_asyncio.create_subprocess_exec.call_args
-        exec_cmd = call_args.args
+        [(exec_cmd, kwargs)] = calls
         assert exec_cmd[0] == "docker"
         assert "sandbox-container" in exec_cmd
         # cwd should be None for docker
-        assert call_args.kwargs.get("cwd") is None
+        assert kwargs.get("cwd") is None
         assert resp.result == "docker OK"
 
 
@@ -936,6 +790,13 @@ class TestDockerIntegration:
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(scope="class")
+def shared_cli() -> CodexCLI:
+    # which() is only consulted in __init__, so the patch can end right away.
+    with pytest.MonkeyPatch.context() as mp:
+        return _make_cli(mp)
+
+
 class TestEdgeCases:
     @pytest.mark.parametrize(
         "model_id",
@@ -947,11 +808,9 @@ class TestEdgeCases:
             "o3-mini",
         ],
     )
-    def test_various_codex_models_in_command(
-        self, monkeypatch: pytest.MonkeyPatch, model_id: str
-    ) -> None:
-        cli = _make_cli(monkeypatch, model=model_id)
-        cmd = cli._build_command("test")
+    def test_various_codex_models_in_command(self, shared_cli: CodexCLI, model_id: str) -> None:
+        shared_cli._config = dataclasses.replace(shared_cli._config, model=model_id)
+        cmd = shared_cli._build_command("test")
         assert model_id in cmd
 
     def test_parse_output_with_unicode_stderr(self) -> None:
@@ -964,79 +823,35 @@ class TestEdgeCases:
         # Should not raise -- errors="replace" handles bad bytes
         assert resp.result  # has some content even if garbled
 
-    def test_parse_output_success_logged(self, caplog: pytest.LogCaptureFixture) -> None:
-        line = json.dumps(
-            {
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": "ok"},
-            }
-        )
-        jsonl = "\n".join(
-            [
-                json.dumps({"type": "thread.started", "thread_id": "th-log"}),
-                line,
-                json.dumps(
-                    {"type": "turn.completed", "usage": {"input_tokens": 1, "output_tokens": 2}}
-                ),
-            ]
-        )
-        with caplog.at_level(logging.INFO, logger="ductor_bot.cli.codex_provider"):
-            resp = CodexCLI._parse_output(jsonl.encode(), b"", 0)
+    def test_parse_output_success_logged(self, log_records: list[logging.LogRecord]) -> None:
+        resp = CodexCLI._parse_output(_JSONL_LOGGED, b"", 0)
         assert resp.is_error is False
-        assert "Codex done" in caplog.text
-        assert "th-log" in caplog.text
+        assert "Codex done" in _log_text(log_records)
+        assert "th-log" in _log_text(log_records)
 
-    def test_parse_output_error_logged(self, caplog: pytest.LogCaptureFixture) -> None:
-        with caplog.at_level(logging.ERROR, logger="ductor_bot.cli.codex_provider"):
-            CodexCLI._parse_output(b"", b"", 0)
-        assert "Codex returned empty output" in caplog.text
+    def test_parse_output_error_logged(self, log_records: list[logging.LogRecord]) -> None:
+        CodexCLI._parse_output(b"", b"", 0)
+        assert "Codex returned empty output" in _log_text(log_records)
 
 
 class TestSendWithoutRegistry:
     async def test_send_no_registry(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """When process_registry is None, send still works without register/unregister."""
         cli = _make_cli(monkeypatch, process_registry=None)
-        jsonl = json.dumps(
-            {
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": "no-reg"},
-            }
-        )
-        proc = _make_process_mock(stdout=jsonl.encode(), returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
+        proc = _FakeProcess(stdout=_AGENT_MSG_NO_REG)
 
-            resp = await cli.send("hello")
+        _patch_spawn(monkeypatch, cli, proc)
+        resp = await cli.send("hello")
 
         assert resp.result == "no-reg"
 
     async def test_streaming_no_registry(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """When process_registry is None, streaming still works."""
         cli = _make_cli(monkeypatch, process_registry=None)
-        lines = [
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "no-reg-stream"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process((_AGENT_MSG_NO_REG_STREAM,), returncode=0)
 
-            events = await _collect_events(cli.send_streaming("hello"))
-
-        text_events = [e for e in events if isinstance(e, AssistantTextDelta)]
-        assert len(text_events) == 1
-        assert text_events[0].text == "no-reg-stream"
+        _patch_spawn(monkeypatch, cli, proc)
+        assert await _collect_text(cli.send_streaming("hello")) == ["no-reg-stream"]
 
 
 class TestResumeCommandArgOrder:
@@ -1062,50 +877,20 @@ class TestStreamingContinueSessionIgnored:
     ) -> None:
         """continue_session=True should not alter streaming behavior."""
         cli = _make_cli(monkeypatch)
-        lines = [
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "streamed"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
-
-            events = await _collect_events(cli.send_streaming("hello", continue_session=True))
+        proc = _make_streaming_process((_AGENT_MSG_STREAMED,), returncode=0)
 
-        text_events = [e for e in events if isinstance(e, AssistantTextDelta)]
-        assert len(text_events) == 1
+        _patch_spawn(monkeypatch, cli, proc)
+        assert len(await _collect_text(cli.send_streaming("hello", continue_session=True))) == 1
 
 
 class TestStreamingNonTextEventsNotAccumulated:
     async def test_tool_events_not_in_final_result(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Only AssistantTextDelta text is accumulated in the final ResultEvent."""
         cli = _make_cli(monkeypatch)
-        lines = [
-            json.dumps({"type": "item.started", "item": {"type": "command_execution"}}),
-            json.dumps(
-                {
-                    "type": "item.completed",
-                    "item": {"type": "agent_message", "text": "Result only"},
-                }
-            ),
-        ]
-        proc = _make_streaming_process(lines, returncode=0)
-
-        with patch("ductor_bot.cli.codex_provider.asyncio") as mock_asyncio:
-            mock_asyncio.timeout = asyncio.timeout
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=proc)
-            mock_asyncio.create_task = asyncio.ensure_future
+        proc = _make_streaming_process(_LINES_RESULT_ONLY, returncode=0)
 
-            events = await _collect_events(cli.send_streaming("hello"))
+        _patch_spawn(monkeypatch, cli, proc)
+        events = await _collect_events(cli.send_streaming("hello"))
 
         result_events = [e for e in events if isinstance(e, ResultEvent)]
         assert len(result_events) == 1
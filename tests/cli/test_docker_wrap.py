@@ -4,39 +4,60 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from ductor_bot.cli.base import docker_wrap
-
-
-def test_docker_wrap_without_container() -> None:
-    cmd = ["claude", "-p", "hello"]
-    result_cmd, cwd = docker_wrap(cmd, "", 123, Path("/workspace"))
-    assert result_cmd == cmd
-    assert cwd == "/workspace"
-
-
-def test_docker_wrap_with_container() -> None:
-    cmd = ["claude", "-p", "hello"]
-    result_cmd, cwd = docker_wrap(cmd, "my-sandbox", 42, Path("/workspace"))
-    assert result_cmd == [
-        "docker",
-        "exec",
-        "-e",
-        "DUCTOR_CHAT_ID=42",
-        "my-sandbox",
-        "claude",
-        "-p",
-        "hello",
-    ]
-    assert cwd is None
-
-
-def test_docker_wrap_preserves_full_command() -> None:
-    cmd = ["claude", "-p", "test", "--model", "opus", "--verbose"]
-    result_cmd, _ = docker_wrap(cmd, "sandbox", 1, Path("/w"))
-    assert result_cmd[-6:] == cmd
+import pytest
 
+from ductor_bot.cli.base import docker_wrap
 
-def test_docker_wrap_injects_chat_id() -> None:
-    cmd = ["codex", "exec"]
-    result_cmd, _ = docker_wrap(cmd, "box", 999, Path("/w"))
-    assert "DUCTOR_CHAT_ID=999" in result_cmd
+WORKSPACE = Path("/workspace")
+
+
+@pytest.mark.parametrize(
+    ("cmd", "container", "chat_id", "expected_cmd", "expected_cwd"),
+    [
+        (["claude", "-p", "hello"], "", 123, ["claude", "-p", "hello"], "/workspace"),
+        (
+            ["claude", "-p", "hello"],
+            "my-sandbox",
+            42,
+            ["docker", "exec", "-e", "DUCTOR_CHAT_ID=42", "my-sandbox", "claude", "-p", "hello"],
+            None,
+        ),
+        (
+            ["claude", "-p", "test", "--model", "opus", "--verbose"],
+            "sandbox",
+            1,
+            [
+                "docker",
+                "exec",
+                "-e",
+                "DUCTOR_CHAT_ID=1",
+                "sandbox",
+                "claude",
+                "-p",
+                "test",
+                "--model",
+                "opus",
+                "--verbose",
+            ],
+            None,
+        ),
+        (
+            ["codex", "exec"],
+            "box",
+            999,
+            ["docker", "exec", "-e", "DUCTOR_CHAT_ID=999", "box", "codex", "exec"],
+            None,
+        ),
+    ],
+    ids=["without_container", "with_container", "preserves_full_command", "injects_chat_id"],
+)
+def test_docker_wrap(
+    cmd: list[str],
+    container: str,
+    chat_id: int,
+    expected_cmd: list[str],
+    expected_cwd: str | None,
+) -> None:
+    result_cmd, cwd = docker_wrap(cmd, container, chat_id, WORKSPACE)
+    assert result_cmd == expected_cmd
+    assert cwd == expected_cwd
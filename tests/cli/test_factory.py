@@ -2,22 +2,18 @@
 
 from __future__ import annotations
 
-from ductor_bot.cli.base import CLIConfig
+import pytest
+
+from ductor_bot.cli.base import BaseCLI, CLIConfig
 from ductor_bot.cli.claude_provider import ClaudeCodeCLI
 from ductor_bot.cli.codex_provider import CodexCLI
 from ductor_bot.cli.factory import create_cli
 
 
-def test_create_cli_returns_claude_by_default() -> None:
-    cli = create_cli(CLIConfig(provider="claude"))
-    assert isinstance(cli, ClaudeCodeCLI)
-
-
-def test_create_cli_returns_codex() -> None:
-    cli = create_cli(CLIConfig(provider="codex"))
-    assert isinstance(cli, CodexCLI)
-
-
-def test_create_cli_unknown_provider_returns_claude() -> None:
-    cli = create_cli(CLIConfig(provider="unknown"))
-    assert isinstance(cli, ClaudeCodeCLI)
+@pytest.mark.parametrize(
+    ("provider", "cls"),
+    [("claude", ClaudeCodeCLI), ("codex", CodexCLI), ("unknown", ClaudeCodeCLI)],
+    ids=["claude_default", "codex", "unknown_falls_back_to_claude"],
+)
+def test_create_cli(provider: str, cls: type[BaseCLI]) -> None:
+    assert isinstance(create_cli(CLIConfig(provider=provider)), cls)
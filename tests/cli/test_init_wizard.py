@@ -6,7 +6,11 @@ import json
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
+from ductor_bot.cli import init_wizard
 from ductor_bot.cli.init_wizard import _write_config, run_onboarding
+from ductor_bot.infra import service
 from ductor_bot.workspace.paths import DuctorPaths
 
 
@@ -43,39 +47,30 @@ def test_write_config_ignores_corrupt_existing_json(tmp_path: Path) -> None:
     assert data["user_timezone"] == "UTC"
 
 
-def test_run_onboarding_returns_false_when_service_install_fails(tmp_path: Path) -> None:
+@pytest.fixture
+def onboarding_stubs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Stub every interactive onboarding step so run_onboarding reaches service install."""
     paths = _make_paths(tmp_path)
-
-    with (
-        patch("ductor_bot.cli.init_wizard._show_banner"),
-        patch("ductor_bot.cli.init_wizard._check_clis"),
-        patch("ductor_bot.cli.init_wizard._show_disclaimer"),
-        patch("ductor_bot.cli.init_wizard._ask_telegram_token", return_value="token"),
-        patch("ductor_bot.cli.init_wizard._ask_user_id", return_value=[1]),
-        patch("ductor_bot.cli.init_wizard._ask_docker", return_value=False),
-        patch("ductor_bot.cli.init_wizard._ask_timezone", return_value="UTC"),
-        patch("ductor_bot.cli.init_wizard._write_config", return_value=paths.config_path),
-        patch("ductor_bot.cli.init_wizard.resolve_paths", return_value=paths),
-        patch("ductor_bot.cli.init_wizard._offer_service_install", return_value=True),
-        patch("ductor_bot.infra.service.install_service", return_value=False),
-    ):
-        assert run_onboarding() is False
+    stubs: dict[str, object] = {
+        "_show_banner": None,
+        "_check_clis": None,
+        "_show_disclaimer": None,
+        "_ask_telegram_token": "token",
+        "_ask_user_id": [1],
+        "_ask_docker": False,
+        "_ask_timezone": "UTC",
+        "_write_config": paths.config_path,
+        "resolve_paths": paths,
+        "_offer_service_install": True,
+    }
+    for name, value in stubs.items():
+        monkeypatch.setattr(init_wizard, name, lambda *_a, _v=value, **_k: _v)
 
 
-def test_run_onboarding_returns_true_when_service_install_succeeds(tmp_path: Path) -> None:
-    paths = _make_paths(tmp_path)
-
-    with (
-        patch("ductor_bot.cli.init_wizard._show_banner"),
-        patch("ductor_bot.cli.init_wizard._check_clis"),
-        patch("ductor_bot.cli.init_wizard._show_disclaimer"),
-        patch("ductor_bot.cli.init_wizard._ask_telegram_token", return_value="token"),
-        patch("ductor_bot.cli.init_wizard._ask_user_id", return_value=[1]),
-        patch("ductor_bot.cli.init_wizard._ask_docker", return_value=False),
-        patch("ductor_bot.cli.init_wizard._ask_timezone", return_value="UTC"),
-        patch("ductor_bot.cli.init_wizard._write_config", return_value=paths.config_path),
-        patch("ductor_bot.cli.init_wizard.resolve_paths", return_value=paths),
-        patch("ductor_bot.cli.init_wizard._offer_service_install", return_value=True),
-        patch("ductor_bot.infra.service.install_service", return_value=True),
-    ):
-        assert run_onboarding() is True
+@pytest.mark.usefixtures("onboarding_stubs")
+@pytest.mark.parametrize("installed", [False, True], ids=["install_fails", "install_succeeds"])
+def test_run_onboarding_reflects_service_install(
+    monkeypatch: pytest.MonkeyPatch, installed: bool
+) -> None:
+    monkeypatch.setattr(service, "install_service", lambda _console: installed)
+    assert run_onboarding() is installed
@@ -13,8 +13,19 @@ from ductor_bot.cli.param_resolver import (
 from ductor_bot.config import AgentConfig
 from ductor_bot.errors import DuctorError
 
-
-@pytest.fixture
+# Task overrides shared read-only across tests (TaskOverrides is frozen).
+_OV_CODEX_MINI_LOW = TaskOverrides(provider="codex", model="gpt-4o-mini", reasoning_effort="low")
+_OV_TASK_PARAMS = TaskOverrides(cli_parameters=["--task-param", "task-value"])
+_OV_INVALID_CLAUDE = TaskOverrides(model="invalid-model")
+_OV_INVALID_CODEX = TaskOverrides(provider="codex", model="nonexistent-model")
+_OV_CODEX_HIGH = TaskOverrides(provider="codex", model="gpt-4o", reasoning_effort="high")
+# gpt-4o-mini has no reasoning support, so "high" must fall back to "".
+_OV_CODEX_MINI_HIGH = TaskOverrides(provider="codex", model="gpt-4o-mini", reasoning_effort="high")
+# Claude ignores reasoning_effort entirely.
+_OV_CLAUDE_HIGH = TaskOverrides(reasoning_effort="high")
+
+
+@pytest.fixture(scope="module")
 def base_config() -> AgentConfig:
     """Default AgentConfig for testing."""
     return AgentConfig(
@@ -25,7 +36,7 @@ def base_config() -> AgentConfig:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def codex_cache() -> CodexModelCache:
     """Mock Codex cache with sample models."""
     return CodexModelCache(
@@ -68,13 +79,7 @@ def test_resolve_with_task_overrides(
     base_config: AgentConfig, codex_cache: CodexModelCache
 ) -> None:
     """Should apply task overrides over global config."""
-    overrides = TaskOverrides(
-        provider="codex",
-        model="gpt-4o-mini",
-        reasoning_effort="low",
-    )
-
-    result = resolve_cli_config(base_config, codex_cache, task_overrides=overrides)
+    result = resolve_cli_config(base_config, codex_cache, task_overrides=_OV_CODEX_MINI_LOW)
 
     assert result.provider == "codex"
     assert result.model == "gpt-4o-mini"
@@ -85,11 +90,7 @@ def test_resolve_with_task_overrides(
 
 def test_resolve_merge_parameters(base_config: AgentConfig, codex_cache: CodexModelCache) -> None:
     """Should use task-specific CLI parameters."""
-    overrides = TaskOverrides(
-        cli_parameters=["--task-param", "task-value"],
-    )
-
-    result = resolve_cli_config(base_config, codex_cache, task_overrides=overrides)
+    result = resolve_cli_config(base_config, codex_cache, task_overrides=_OV_TASK_PARAMS)
 
     # Should contain task params (no global provider-specific params in flat config)
     assert result.cli_parameters == ["--task-param", "task-value"]
@@ -99,36 +100,23 @@ def test_resolve_invalid_claude_model(
     base_config: AgentConfig, codex_cache: CodexModelCache
 ) -> None:
     """Should raise error for invalid Claude model."""
-    overrides = TaskOverrides(model="invalid-model")
-
     with pytest.raises(DuctorError, match="Invalid Claude model"):
-        resolve_cli_config(base_config, codex_cache, task_overrides=overrides)
+        resolve_cli_config(base_config, codex_cache, task_overrides=_OV_INVALID_CLAUDE)
 
 
 def test_resolve_invalid_codex_model(
     base_config: AgentConfig, codex_cache: CodexModelCache
 ) -> None:
     """Should raise error for invalid Codex model."""
-    overrides = TaskOverrides(
-        provider="codex",
-        model="nonexistent-model",
-    )
-
     with pytest.raises(DuctorError, match="Invalid Codex model"):
-        resolve_cli_config(base_config, codex_cache, task_overrides=overrides)
+        resolve_cli_config(base_config, codex_cache, task_overrides=_OV_INVALID_CODEX)
 
 
 def test_resolve_codex_reasoning_effort(
     base_config: AgentConfig, codex_cache: CodexModelCache
 ) -> None:
     """Should validate and apply reasoning effort for Codex models."""
-    overrides = TaskOverrides(
-        provider="codex",
-        model="gpt-4o",
-        reasoning_effort="high",
-    )
-
-    result = resolve_cli_config(base_config, codex_cache, task_overrides=overrides)
+    result = resolve_cli_config(base_config, codex_cache, task_overrides=_OV_CODEX_HIGH)
 
     assert result.provider == "codex"
     assert result.model == "gpt-4o"
@@ -139,13 +127,7 @@ def test_resolve_codex_effort_fallback(
     base_config: AgentConfig, codex_cache: CodexModelCache
 ) -> None:
     """Should fall back to empty reasoning effort for non-reasoning models."""
-    overrides = TaskOverrides(
-        provider="codex",
-        model="gpt-4o-mini",
-        reasoning_effort="high",  # Attempt to set, but model doesn't support
-    )
-
-    result = resolve_cli_config(base_config, codex_cache, task_overrides=overrides)
+    result = resolve_cli_config(base_config, codex_cache, task_overrides=_OV_CODEX_MINI_HIGH)
 
     assert result.model == "gpt-4o-mini"
     assert result.reasoning_effort == ""
@@ -155,11 +137,7 @@ def test_resolve_claude_ignores_reasoning(
     base_config: AgentConfig, codex_cache: CodexModelCache
 ) -> None:
     """Should ignore reasoning_effort for Claude provider."""
-    overrides = TaskOverrides(
-        reasoning_effort="high",  # Should be ignored for Claude
-    )
-
-    result = resolve_cli_config(base_config, codex_cache, task_overrides=overrides)
+    result = resolve_cli_config(base_config, codex_cache, task_overrides=_OV_CLAUDE_HIGH)
 
     assert result.provider == "claude"
     assert result.reasoning_effort == ""
@@ -3,22 +3,15 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+
+import pytest
 
 from ductor_bot.cli.claude_provider import _parse_response
 from ductor_bot.cli.codex_events import parse_codex_jsonl
 
-# -- Claude _parse_response --
-
-
-def test_parse_empty_stdout() -> None:
-    resp = _parse_response(b"", b"", 0)
-    assert resp.is_error is True
-    assert resp.result == ""
-
-
-def test_parse_valid_json_response() -> None:
-    data = {
+# Serialized once at import; the tests only parse them.
+_CLAUDE_VALID = json.dumps(
+    {
         "session_id": "sess-abc",
         "result": "Hello world!",
         "is_error": False,
@@ -29,7 +22,27 @@ def test_parse_valid_json_response() -> None:
         "usage": {"input_tokens": 500, "output_tokens": 200},
         "modelUsage": {"claude-opus-4-20250514": {"input_tokens": 500}},
     }
-    resp = _parse_response(json.dumps(data).encode(), b"", 0)
+).encode()
+_CODEX_LEGACY = json.dumps(
+    {
+        "type": "message",
+        "role": "assistant",
+        "content": [{"type": "text", "text": "Legacy output"}],
+    }
+)
+
+# -- Claude _parse_response --
+
+
+@pytest.mark.parametrize("stdout", [b"", b"   \n\t  "], ids=["empty", "whitespace_only"])
+def test_parse_empty_stdout(stdout: bytes) -> None:
+    resp = _parse_response(stdout, b"", 0)
+    assert resp.is_error is True
+    assert resp.result == ""
+
+
+def test_parse_valid_json_response() -> None:
+    resp = _parse_response(_CLAUDE_VALID, b"", 0)
     assert resp.is_error is False
     assert resp.result == "Hello world!"
     assert resp.session_id == "sess-abc"
@@ -39,14 +52,15 @@ def test_parse_valid_json_response() -> None:
     assert resp.output_tokens == 200
     assert resp.total_tokens == 700
     assert resp.duration_ms == 1500.0
+    assert resp.duration_api_ms == 1200.0
     assert resp.model_usage["claude-opus-4-20250514"]["input_tokens"] == 500
 
 
 def test_parse_error_response() -> None:
-    data = {"result": "Rate limit exceeded", "is_error": True}
-    resp = _parse_response(json.dumps(data).encode(), b"", 1)
+    resp = _parse_response(b'{"result":"Rate limit exceeded","is_error":true}', b"", 1)
     assert resp.is_error is True
     assert resp.result == "Rate limit exceeded"
+    assert resp.returncode == 1
 
 
 def test_parse_invalid_json_stdout() -> None:
@@ -56,25 +70,39 @@ def test_parse_invalid_json_stdout() -> None:
 
 
 def test_parse_stderr_captured() -> None:
-    data = {"result": "OK", "is_error": False}
-    resp = _parse_response(json.dumps(data).encode(), b"some warning text", 0)
+    resp = _parse_response(b'{"result":"OK","is_error":false}', b"some warning text", 0)
     assert resp.is_error is False
     assert resp.result == "OK"
+    assert resp.stderr == "some warning text"
+
+
+def test_parse_stderr_truncated_at_2000_chars() -> None:
+    resp = _parse_response(b'{"result":"OK","is_error":false}', b"E" * 5000, 0)
+    assert len(resp.stderr) == 2000
+
+
+def test_parse_json_with_surrounding_whitespace() -> None:
+    resp = _parse_response(b'\n  {"result":"trimmed","is_error":false}  \n', b"", 0)
+    assert resp.result == "trimmed"
+    assert resp.is_error is False
 
 
 def test_parse_missing_fields_use_defaults() -> None:
-    data: dict[str, Any] = {}
-    resp = _parse_response(json.dumps(data).encode(), b"", 0)
+    resp = _parse_response(b"{}", b"", 0)
     assert resp.result == ""
     assert resp.is_error is False
     assert resp.session_id is None
     assert resp.total_cost_usd is None
+    assert resp.usage == {}
+    assert resp.model_usage == {}
+    assert resp.total_tokens == 0
+    assert resp.stderr == ""
 
 
-def test_parse_returncode_captured() -> None:
-    data = {"result": "done", "is_error": False}
-    resp = _parse_response(json.dumps(data).encode(), b"", 42)
-    assert resp.returncode == 42
+@pytest.mark.parametrize("returncode", [42, None], ids=["int", "none"])
+def test_parse_returncode_captured(returncode: int | None) -> None:
+    resp = _parse_response(b'{"result":"done","is_error":false}', b"", returncode)
+    assert resp.returncode == returncode
 
 
 # -- Codex parse_codex_jsonl --
@@ -82,34 +110,27 @@ def test_parse_returncode_captured() -> None:
 
 def test_codex_parse_legacy_message_format() -> None:
     """The message/assistant/content[] format used by openclaw-compat."""
-    line = json.dumps(
-        {
-            "type": "message",
-            "role": "assistant",
-            "content": [{"type": "text", "text": "Legacy output"}],
-        }
-    )
-    text, _, _ = parse_codex_jsonl(line)
+    text, _, _ = parse_codex_jsonl(_CODEX_LEGACY)
     assert text == "Legacy output"
 
 
 def test_codex_parse_fallback_item_text() -> None:
     """Top-level item.text with empty type should be extracted."""
-    line = json.dumps({"item": {"type": "", "text": "Fallback text"}})
+    line = '{"item":{"type":"","text":"Fallback text"}}'
     text, _, _ = parse_codex_jsonl(line)
     assert text == "Fallback text"
 
 
 def test_codex_parse_thread_id_fallback() -> None:
     """thread_id at top level (not in thread.started event)."""
-    line = json.dumps({"thread_id": "fallback-tid"})
+    line = '{"thread_id":"fallback-tid"}'
     _, tid, _ = parse_codex_jsonl(line)
     assert tid == "fallback-tid"
 
 
 def test_codex_parse_usage_fallback() -> None:
     """usage at top level (not in turn.completed event)."""
-    line = json.dumps({"usage": {"total_tokens": 999}})
+    line = '{"usage":{"total_tokens":999}}'
     _, _, usage = parse_codex_jsonl(line)
     assert usage is not None
     assert usage["total_tokens"] == 999
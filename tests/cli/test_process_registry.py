@@ -3,19 +3,48 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import Iterable
+from unittest.mock import AsyncMock, patch
+
+import pytest
 
 from ductor_bot.cli.process_registry import ProcessRegistry, TrackedProcess
 
 
-def _mock_process(*, pid: int = 1, returncode: int | None = None) -> MagicMock:
-    proc = MagicMock(spec=asyncio.subprocess.Process)
-    proc.pid = pid
-    proc.returncode = returncode
-    proc.wait = AsyncMock(return_value=returncode)
-    proc.kill = MagicMock()
-    proc.send_signal = MagicMock()
-    return proc
+class _FakeProc:
+    """Minimal stand-in for ``asyncio.subprocess.Process``."""
+
+    __slots__ = ("killed", "pid", "returncode", "terminated")
+
+    def __init__(self, pid: int, returncode: int | None) -> None:
+        self.pid = pid
+        self.returncode = returncode
+        self.terminated = 0
+        self.killed = 0
+
+    def terminate(self) -> None:
+        self.terminated += 1
+
+    def kill(self) -> None:
+        self.killed += 1
+
+    def send_signal(self, _sig: int) -> None:
+        pass
+
+    async def wait(self) -> int | None:
+        return self.returncode
+
+
+def _mock_process(*, pid: int = 1, returncode: int | None = None) -> _FakeProc:
+    return _FakeProc(pid, returncode)
+
+
+def _reg_many(reg: ProcessRegistry, entries: Iterable[tuple[int, int]]) -> list[TrackedProcess]:
+    """Register one live fake process per ``(chat_id, pid)`` pair under label ``main``."""
+    return [
+        reg.register(chat_id=cid, process=_FakeProc(pid, None), label="main")
+        for cid, pid in entries
+    ]
 
 
 def test_register_returns_tracked() -> None:
@@ -77,7 +106,17 @@ async def test_kill_all_empty_returns_zero() -> None:
 
 def test_multiple_chats_isolated() -> None:
     reg = ProcessRegistry()
-    proc1 = _mock_process(pid=1)
-    proc2 = _mock_process(pid=2)
-    reg.register(chat_id=1, process=proc1, label="main")
-    reg.register(chat_id=2, process=proc2, label="main")
+    _reg_many(reg, [(1, 1), (2, 2)])
+    reg.unregister(reg._processes[1][0])
+    assert reg.has_active(1) is False
+    assert reg.has_active(2) is True
+
+
+@pytest.mark.parametrize("n", [1, 100])
+async def test_kill_all_many_chats(n: int) -> None:
+    reg = ProcessRegistry()
+    tracked = _reg_many(reg, ((cid, cid + 1000) for cid in range(n)))
+    with patch("ductor_bot.cli.process_registry.asyncio.sleep", new_callable=AsyncMock):
+        counts = await asyncio.gather(*(reg.kill_all(chat_id=cid) for cid in range(n)))
+    assert counts == [1] * n
+    assert all(t.process.terminated == 1 for t in tracked)
@@ -2,15 +2,56 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import Any
 
+import pytest
+
+from ductor_bot.cli import claude_provider, codex_provider
 from ductor_bot.cli.base import CLIConfig, docker_wrap
 from ductor_bot.cli.claude_provider import ClaudeCodeCLI
 from ductor_bot.cli.codex_provider import CodexCLI
+from tests.cli.conftest import flag_values
+
+
+def _cache_key(kwargs: dict[str, Any]) -> str:
+    # CLIConfig fields include lists, so key on the repr rather than the values.
+    return repr(sorted(kwargs.items()))
+
+
+@pytest.fixture(scope="module")
+def claude_cli_factory() -> Callable[..., ClaudeCodeCLI]:
+    """Return a builder that reuses one ClaudeCodeCLI per distinct config."""
+    cache: dict[str, ClaudeCodeCLI] = {}
+
+    def make(**kwargs: Any) -> ClaudeCodeCLI:
+        key = _cache_key(kwargs)
+        if key not in cache:
+            # Only __init__ consults which(), so patch it just around construction.
+            with pytest.MonkeyPatch.context() as mp:
+                mp.setattr(claude_provider, "which", lambda _: "/usr/bin/claude")
+                cache[key] = ClaudeCodeCLI(CLIConfig(provider="claude", model="opus", **kwargs))
+        return cache[key]
+
+    return make
+
+
+@pytest.fixture(scope="module")
+def codex_cli_factory() -> Callable[..., CodexCLI]:
+    """Return a builder that reuses one CodexCLI per distinct config."""
+    cache: dict[str, CodexCLI] = {}
+
+    def make(**kwargs: Any) -> CodexCLI:
+        key = _cache_key(kwargs)
+        if key not in cache:
+            with pytest.MonkeyPatch.context() as mp:
+                mp.setattr(codex_provider, "which", lambda _: "/usr/bin/codex")
+                cache[key] = CodexCLI(CLIConfig(provider="codex", model="gpt-5.2-codex", **kwargs))
+        return cache[key]
+
+    return make
 
-if TYPE_CHECKING:
-    import pytest
 
 # -- docker_wrap --
 
@@ -33,86 +74,107 @@ def test_docker_wrap_with_container(tmp_path: Path) -> None:
 
 # -- ClaudeCodeCLI command building --
 
-
-def test_claude_build_command_basic(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.claude_provider.which", lambda _: "/usr/bin/claude")
-    cfg = CLIConfig(provider="claude", model="opus", permission_mode="bypassPermissions")
-    cli = ClaudeCodeCLI(cfg)
-    cmd = cli._build_command("hello")
+# (cfg_kwargs, build_kwargs, tokens that must be present, flag -> following value,
+#  token runs that must appear contiguously, e.g. a flag followed by several values).
+_BuildCase = tuple[
+    dict[str, Any], dict[str, Any], frozenset[str], dict[str, str], tuple[tuple[str, ...], ...]
+]
+
+_CLAUDE_BUILD_CASES: list[_BuildCase] = [
+    (
+        {"permission_mode": "bypassPermissions"},
+        {},
+        frozenset({"-p"}),
+        {"--output-format": "json", "--permission-mode": "bypassPermissions", "--model": "opus"},
+        (),
+    ),
+    ({}, {"resume_session": "session-123"}, frozenset(), {"--resume": "session-123"}, ()),
+    ({}, {"continue_session": True}, frozenset({"--continue"}), {}, ()),
+    ({"system_prompt": "Be helpful"}, {}, frozenset(), {"--system-prompt": "Be helpful"}, ()),
+    (
+        {"append_system_prompt": "Extra rules"},
+        {},
+        frozenset(),
+        {"--append-system-prompt": "Extra rules"},
+        (),
+    ),
+    ({"max_turns": 5}, {}, frozenset(), {"--max-turns": "5"}, ()),
+    (
+        {"allowed_tools": ["Read", "Write"]},
+        {},
+        frozenset(),
+        {},
+        (("--allowedTools", "Read", "Write"),),
+    ),
+]
+
+_CODEX_BUILD_CASES: list[_BuildCase] = [
+    (
+        {"permission_mode": "bypassPermissions"},
+        {},
+        frozenset({"--dangerously-bypass-approvals-and-sandbox"}),
+        {"--model": "gpt-5.2-codex"},
+        (("exec", "--json"),),
+    ),
+    (
+        {},
+        {"resume_session": "thread-abc"},
+        frozenset(),
+        {"--": "thread-abc"},
+        (("exec", "resume"),),
+    ),
+    ({"reasoning_effort": "high"}, {}, frozenset(), {"-c": "model_reasoning_effort=high"}, ()),
+    ({"images": ["img.png"]}, {}, frozenset(), {"--image": "img.png"}, ()),
+]
+
+
+def _assert_command(
+    cmd: list[str],
+    tokens: frozenset[str],
+    values: dict[str, str],
+    runs: tuple[tuple[str, ...], ...],
+) -> None:
+    assert tokens <= set(cmd)
+    fv = flag_values(cmd)
+    for flag, value in values.items():
+        assert fv[flag] == value
+    for run in runs:
+        i = cmd.index(run[0])
+        assert cmd[i : i + len(run)] == list(run)
+
+
+@pytest.mark.parametrize(
+    ("cfg_kwargs", "build_kwargs", "tokens", "values", "runs"),
+    _CLAUDE_BUILD_CASES,
+    ids=[
+        "basic",
+        "resume",
+        "continue",
+        "system_prompt",
+        "append_system_prompt",
+        "max_turns",
+        "allowed_tools",
+    ],
+)
+def test_claude_build_command(
+    claude_cli_factory: Callable[..., ClaudeCodeCLI],
+    *,
+    cfg_kwargs: dict[str, Any],
+    build_kwargs: dict[str, Any],
+    tokens: frozenset[str],
+    values: dict[str, str],
+    runs: tuple[tuple[str, ...], ...],
+) -> None:
+    cmd = claude_cli_factory(**cfg_kwargs)._build_command("hello", **build_kwargs)
     assert cmd[0] == "/usr/bin/claude"
-    assert "-p" in cmd
-    assert "--output-format" in cmd
-    assert "json" in cmd
-    assert "--permission-mode" in cmd
-    assert "bypassPermissions" in cmd
-    assert "--model" in cmd
-    assert "opus" in cmd
     assert cmd[-1] == "hello"
+    _assert_command(cmd, tokens, values, runs)
 
 
-def test_claude_build_command_with_resume(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.claude_provider.which", lambda _: "/usr/bin/claude")
-    cfg = CLIConfig(provider="claude", model="opus")
-    cli = ClaudeCodeCLI(cfg)
-    cmd = cli._build_command("hello", resume_session="session-123")
-    assert "--resume" in cmd
-    assert "session-123" in cmd
-
-
-def test_claude_build_command_with_continue(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.claude_provider.which", lambda _: "/usr/bin/claude")
-    cfg = CLIConfig(provider="claude", model="opus")
-    cli = ClaudeCodeCLI(cfg)
-    cmd = cli._build_command("hello", continue_session=True)
-    assert "--continue" in cmd
-
-
-def test_claude_build_command_with_system_prompt(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.claude_provider.which", lambda _: "/usr/bin/claude")
-    cfg = CLIConfig(provider="claude", model="opus", system_prompt="Be helpful")
-    cli = ClaudeCodeCLI(cfg)
-    cmd = cli._build_command("hello")
-    assert "--system-prompt" in cmd
-    idx = cmd.index("--system-prompt")
-    assert cmd[idx + 1] == "Be helpful"
-
-
-def test_claude_build_command_with_append_system_prompt(
-    monkeypatch: pytest.MonkeyPatch,
+def test_claude_streaming_command_uses_stream_json(
+    claude_cli_factory: Callable[..., ClaudeCodeCLI],
 ) -> None:
-    monkeypatch.setattr("ductor_bot.cli.claude_provider.which", lambda _: "/usr/bin/claude")
-    cfg = CLIConfig(provider="claude", model="opus", append_system_prompt="Extra rules")
-    cli = ClaudeCodeCLI(cfg)
-    cmd = cli._build_command("hello")
-    assert "--append-system-prompt" in cmd
-
-
-def test_claude_build_command_with_max_turns(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.claude_provider.which", lambda _: "/usr/bin/claude")
-    cfg = CLIConfig(provider="claude", model="opus", max_turns=5)
-    cli = ClaudeCodeCLI(cfg)
-    cmd = cli._build_command("hello")
-    assert "--max-turns" in cmd
-    idx = cmd.index("--max-turns")
-    assert cmd[idx + 1] == "5"
-
-
-def test_claude_build_command_with_allowed_tools(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.claude_provider.which", lambda _: "/usr/bin/claude")
-    cfg = CLIConfig(provider="claude", model="opus", allowed_tools=["Read", "Write"])
-    cli = ClaudeCodeCLI(cfg)
-    cmd = cli._build_command("hello")
-    assert "--allowedTools" in cmd
-    idx = cmd.index("--allowedTools")
-    assert cmd[idx + 1] == "Read"
-    assert cmd[idx + 2] == "Write"
-
-
-def test_claude_streaming_command_uses_stream_json(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.claude_provider.which", lambda _: "/usr/bin/claude")
-    cfg = CLIConfig(provider="claude", model="opus")
-    cli = ClaudeCodeCLI(cfg)
-    cmd = cli._build_command_streaming("hello")
+    cmd = claude_cli_factory()._build_command_streaming("hello")
     assert "stream-json" in cmd
     assert "json" not in cmd
     assert "--verbose" in cmd
@@ -121,27 +183,29 @@ def test_claude_streaming_command_uses_stream_json(monkeypatch: pytest.MonkeyPat
 # -- CodexCLI command building --
 
 
-def test_codex_build_command_basic(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    cfg = CLIConfig(provider="codex", model="gpt-5.2-codex", permission_mode="bypassPermissions")
-    cli = CodexCLI(cfg)
-    cmd = cli._build_command("hello")
+@pytest.mark.parametrize(
+    ("cfg_kwargs", "build_kwargs", "tokens", "values", "runs"),
+    _CODEX_BUILD_CASES,
+    ids=["basic", "resume", "reasoning_effort", "images"],
+)
+def test_codex_build_command(
+    codex_cli_factory: Callable[..., CodexCLI],
+    *,
+    cfg_kwargs: dict[str, Any],
+    build_kwargs: dict[str, Any],
+    tokens: frozenset[str],
+    values: dict[str, str],
+    runs: tuple[tuple[str, ...], ...],
+) -> None:
+    cmd = codex_cli_factory(**cfg_kwargs)._build_command("hello", **build_kwargs)
     assert cmd[0] == "/usr/bin/codex"
-    assert "exec" in cmd
-    assert "--json" in cmd
-    assert "--model" in cmd
-    assert "gpt-5.2-codex" in cmd
-    assert "--dangerously-bypass-approvals-and-sandbox" in cmd
-
-
-def test_codex_compose_prompt_injects_system_context(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    cfg = CLIConfig(
-        provider="codex",
-        system_prompt="System",
-        append_system_prompt="Append",
-    )
-    cli = CodexCLI(cfg)
+    _assert_command(cmd, tokens, values, runs)
+
+
+def test_codex_compose_prompt_injects_system_context(
+    codex_cli_factory: Callable[..., CodexCLI],
+) -> None:
+    cli = codex_cli_factory(system_prompt="System", append_system_prompt="Append")
     composed = cli._compose_prompt("User message")
     assert "System" in composed
     assert "User message" in composed
@@ -150,51 +214,20 @@ def test_codex_compose_prompt_injects_system_context(monkeypatch: pytest.MonkeyP
     assert composed.index("System") < composed.index("User message")
 
 
-def test_codex_sandbox_flags_bypass(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    cfg = CLIConfig(provider="codex", permission_mode="bypassPermissions")
-    cli = CodexCLI(cfg)
-    flags = cli._sandbox_flags()
-    assert "--dangerously-bypass-approvals-and-sandbox" in flags
-
-
-def test_codex_sandbox_flags_full_access(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    cfg = CLIConfig(provider="codex", permission_mode="other", sandbox_mode="full-access")
-    cli = CodexCLI(cfg)
-    flags = cli._sandbox_flags()
-    assert flags == ["--sandbox", "danger-full-access"]
-
-
-def test_codex_sandbox_flags_workspace_write(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    cfg = CLIConfig(provider="codex", permission_mode="other", sandbox_mode="workspace-write")
-    cli = CodexCLI(cfg)
-    flags = cli._sandbox_flags()
-    assert "--full-auto" in flags
-
-
-def test_codex_build_command_with_resume(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    cfg = CLIConfig(provider="codex", model="gpt-5.2-codex")
-    cli = CodexCLI(cfg)
-    cmd = cli._build_command("hello", resume_session="thread-abc")
-    assert "resume" in cmd
-    assert "thread-abc" in cmd
-
-
-def test_codex_build_command_with_reasoning_effort(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    cfg = CLIConfig(provider="codex", model="gpt-5.2-codex", reasoning_effort="high")
-    cli = CodexCLI(cfg)
-    cmd = cli._build_command("hello")
-    assert "-c" in cmd
-
-
-def test_codex_build_command_with_images(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr("ductor_bot.cli.codex_provider.which", lambda _: "/usr/bin/codex")
-    cfg = CLIConfig(provider="codex", model="gpt-5.2-codex", images=["img.png"])
-    cli = CodexCLI(cfg)
-    cmd = cli._build_command("hello")
-    assert "--image" in cmd
-    assert "img.png" in cmd
+@pytest.mark.parametrize(
+    ("permission_mode", "sandbox_mode", "expected"),
+    [
+        ("bypassPermissions", "read-only", ["--dangerously-bypass-approvals-and-sandbox"]),
+        ("other", "full-access", ["--sandbox", "danger-full-access"]),
+        ("other", "workspace-write", ["--full-auto"]),
+    ],
+    ids=["bypass", "full_access", "workspace_write"],
+)
+def test_codex_sandbox_flags(
+    codex_cli_factory: Callable[..., CodexCLI],
+    permission_mode: str,
+    sandbox_mode: str,
+    expected: list[str],
+) -> None:
+    cli = codex_cli_factory(permission_mode=permission_mode, sandbox_mode=sandbox_mode)
+    assert cli._sandbox_flags() == expected
@@ -2,50 +2,35 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
 
-from ductor_bot.cli.process_registry import ProcessRegistry
-from ductor_bot.cli.service import CLIService, CLIServiceConfig
+import pytest
+
+from ductor_bot.cli.service import CLIService
 from ductor_bot.cli.stream_events import StreamEvent
 from ductor_bot.cli.types import AgentRequest, CLIResponse
-from ductor_bot.config import ModelRegistry
-
 
-def _make_service(**overrides: Any) -> CLIService:
-    config = CLIServiceConfig(
-        working_dir=overrides.pop("working_dir", "/tmp"),
-        default_model=overrides.pop("default_model", "opus"),
-        provider=overrides.pop("provider", "claude"),
-        max_turns=overrides.pop("max_turns", None),
-        max_budget_usd=overrides.pop("max_budget_usd", None),
-        permission_mode=overrides.pop("permission_mode", "bypassPermissions"),
-    )
-    models = ModelRegistry()
+# AgentRequest is frozen, so the requests are shared across tests.
+_REQ_HELLO = AgentRequest(prompt="hello", chat_id=1)
+_REQ_FAIL = AgentRequest(prompt="fail", chat_id=1)
+_PROVIDERS_BOTH = frozenset({"claude", "codex"})
 
-    return CLIService(
-        config=config,
-        models=models,
-        available_providers=frozenset({"claude"}),
-        process_registry=ProcessRegistry(),
-    )
 
-
-async def test_execute_returns_agent_response() -> None:
-    svc = _make_service()
+@pytest.mark.usefixtures("patched_create_cli")
+async def test_execute_returns_agent_response(
+    make_service: Callable[..., CLIService], cli_mock: Any
+) -> None:
+    svc = make_service()
     mock_response = CLIResponse(
         result="Hello!",
         session_id="sess-1",
         total_cost_usd=0.05,
         usage={"input_tokens": 500, "output_tokens": 200},
     )
-    with patch("ductor_bot.cli.service.create_cli") as mock_create:
-        mock_cli = AsyncMock()
-        mock_cli.send.return_value = mock_response
-        mock_create.return_value = mock_cli
+    cli_mock.send.return_value = mock_response
 
-        resp = await svc.execute(AgentRequest(prompt="hello", chat_id=1))
+    resp = await svc.execute(_REQ_HELLO)
 
     assert resp.result == "Hello!"
     assert resp.session_id == "sess-1"
@@ -53,22 +38,25 @@ async def test_execute_returns_agent_response() -> None:
     assert resp.is_error is False
 
 
-async def test_execute_error_response() -> None:
-    svc = _make_service()
+@pytest.mark.usefixtures("patched_create_cli")
+async def test_execute_error_response(
+    make_service: Callable[..., CLIService], cli_mock: Any
+) -> None:
+    svc = make_service()
     mock_response = CLIResponse(result="Error occurred", is_error=True)
-    with patch("ductor_bot.cli.service.create_cli") as mock_create:
-        mock_cli = AsyncMock()
-        mock_cli.send.return_value = mock_response
-        mock_create.return_value = mock_cli
+    cli_mock.send.return_value = mock_response
 
-        resp = await svc.execute(AgentRequest(prompt="fail", chat_id=1))
+    resp = await svc.execute(_REQ_FAIL)
 
     assert resp.is_error is True
     assert resp.result == "Error occurred"
 
 
-async def test_execute_streaming_success() -> None:
-    svc = _make_service()
+@pytest.mark.usefixtures("patched_create_cli")
+async def test_execute_streaming_success(
+    make_service: Callable[..., CLIService], cli_mock: Any
+) -> None:
+    svc = make_service()
 
     from ductor_bot.cli.stream_events import AssistantTextDelta, ResultEvent
 
@@ -88,44 +76,41 @@ async def test_execute_streaming_success() -> None:
     async def on_delta(text: str) -> None:
         deltas.append(text)
 
-    with patch("ductor_bot.cli.service.create_cli") as mock_create:
-        mock_cli = MagicMock()
-        mock_cli.send_streaming = fake_stream
-        mock_create.return_value = mock_cli
+    cli_mock.send_streaming.side_effect = fake_stream
 
-        resp = await svc.execute_streaming(
-            AgentRequest(prompt="hello", chat_id=1),
-            on_text_delta=on_delta,
-        )
+    resp = await svc.execute_streaming(
+        _REQ_HELLO,
+        on_text_delta=on_delta,
+    )
 
     assert resp.result == "Hello world!"
     assert resp.session_id == "sess-1"
     assert deltas == ["Hello ", "world!"]
 
 
-async def test_execute_streaming_fallback_on_error() -> None:
-    svc = _make_service()
+@pytest.mark.usefixtures("patched_create_cli")
+async def test_execute_streaming_fallback_on_error(
+    make_service: Callable[..., CLIService], cli_mock: Any
+) -> None:
+    svc = make_service()
 
     mock_response = CLIResponse(result="Fallback result", session_id="sess-2")
-    with patch("ductor_bot.cli.service.create_cli") as mock_create:
-        mock_cli = MagicMock()
-        mock_cli.send_streaming = MagicMock(side_effect=RuntimeError("Stream broken"))
-        mock_cli.send = AsyncMock(return_value=mock_response)
-        mock_create.return_value = mock_cli
+    cli_mock.send_streaming.side_effect = RuntimeError("Stream broken")
+    cli_mock.send.return_value = mock_response
 
-        resp = await svc.execute_streaming(AgentRequest(prompt="hello", chat_id=1))
+    resp = await svc.execute_streaming(_REQ_HELLO)
 
     assert resp.stream_fallback is True
     assert resp.result == "Fallback result"
 
 
-def test_update_default_model() -> None:
-    svc = _make_service()
+def test_update_default_model(make_service: Callable[..., CLIService]) -> None:
+    svc = make_service()
     svc.update_default_model("sonnet")
     assert svc._config.default_model == "sonnet"
 
 
-def test_update_available_providers() -> None:
-    svc = _make_service()
-    svc.update_available_providers(frozenset({"claude", "codex"}))
-    assert svc._available_providers == frozenset({"claude", "codex"})
+def test_update_available_providers(make_service: Callable[..., CLIService]) -> None:
+    svc = make_service()
+    svc.update_available_providers(_PROVIDERS_BOTH)
+    assert svc._available_providers == _PROVIDERS_BOTH
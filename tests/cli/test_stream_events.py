@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import json
+from typing import Any
+
+import pytest
 
 from ductor_bot.cli.stream_events import (
     AssistantTextDelta,
@@ -14,20 +17,9 @@ from ductor_bot.cli.stream_events import (
     parse_stream_line,
 )
 
-# -- parse_stream_line --
-
-
-def test_empty_line_returns_empty() -> None:
-    assert parse_stream_line("") == []
-    assert parse_stream_line("   ") == []
-
-
-def test_invalid_json_returns_empty() -> None:
-    assert parse_stream_line("not json") == []
-
-
-def test_parse_result_event() -> None:
-    data = {
+# Serialized once at import so each test only exercises parse_stream_line.
+_RESULT_LINE = json.dumps(
+    {
         "type": "result",
         "session_id": "abc-123",
         "result": "Done.",
@@ -37,105 +29,82 @@ def test_parse_result_event() -> None:
         "usage": {"input_tokens": 500, "output_tokens": 200},
         "num_turns": 3,
     }
-    events = parse_stream_line(json.dumps(data))
-    assert len(events) == 1
-    event = events[0]
-    assert isinstance(event, ResultEvent)
-    assert event.session_id == "abc-123"
-    assert event.result == "Done."
-    assert event.is_error is False
-    assert event.total_cost_usd == 0.05
-    assert event.num_turns == 3
-
-
-def test_parse_system_init_event() -> None:
-    data = {"type": "system", "subtype": "init", "session_id": "sess-1"}
-    events = parse_stream_line(json.dumps(data))
-    assert len(events) == 1
-    event = events[0]
-    assert isinstance(event, SystemInitEvent)
-    assert event.session_id == "sess-1"
-
-
-def test_parse_assistant_text() -> None:
-    data = {
-        "type": "assistant",
-        "message": {"content": [{"type": "text", "text": "Hello world"}]},
-    }
-    events = parse_stream_line(json.dumps(data))
-    assert len(events) == 1
-    assert isinstance(events[0], AssistantTextDelta)
-    assert events[0].text == "Hello world"
-
-
-def test_parse_assistant_tool_use() -> None:
-    data = {
-        "type": "assistant",
-        "message": {"content": [{"type": "tool_use", "name": "Read"}]},
-    }
-    events = parse_stream_line(json.dumps(data))
-    assert len(events) == 1
-    assert isinstance(events[0], ToolUseEvent)
-    assert events[0].tool_name == "Read"
-
-
-def test_parse_assistant_thinking() -> None:
-    data = {
-        "type": "assistant",
-        "message": {"content": [{"type": "thinking", "text": "Let me think..."}]},
-    }
-    events = parse_stream_line(json.dumps(data))
-    assert len(events) == 1
-    assert isinstance(events[0], ThinkingEvent)
-    assert events[0].text == "Let me think..."
-
-
-def test_parse_multiple_content_blocks() -> None:
-    data = {
-        "type": "assistant",
-        "message": {
-            "content": [
-                {"type": "text", "text": "Part 1"},
-                {"type": "tool_use", "name": "Bash"},
-                {"type": "text", "text": "Part 2"},
-            ]
-        },
-    }
-    events = parse_stream_line(json.dumps(data))
-    assert len(events) == 3
-    assert isinstance(events[0], AssistantTextDelta)
-    assert isinstance(events[1], ToolUseEvent)
-    assert isinstance(events[2], AssistantTextDelta)
+)
+_RESULT_BARE_LINE = json.dumps({"type": "result"})
+_SYSTEM_INIT_LINE = json.dumps({"type": "system", "subtype": "init", "session_id": "sess-1"})
+_SYSTEM_OTHER_LINE = json.dumps({"type": "system", "subtype": "other"})
+_UNKNOWN_TYPE_LINE = json.dumps({"type": "unknown_type"})
 
 
-def test_parse_empty_text_skipped() -> None:
-    data = {
-        "type": "assistant",
-        "message": {"content": [{"type": "text", "text": ""}]},
-    }
-    events = parse_stream_line(json.dumps(data))
-    assert events == []
+def _assistant_line(*blocks: dict[str, Any]) -> str:
+    return json.dumps({"type": "assistant", "message": {"content": list(blocks)}})
 
 
-def test_parse_unknown_type_returns_empty() -> None:
-    data = {"type": "unknown_type"}
-    assert parse_stream_line(json.dumps(data)) == []
-
+_TEXT_LINE = _assistant_line({"type": "text", "text": "Hello world"})
+_EMPTY_TEXT_LINE = _assistant_line({"type": "text", "text": ""})
+_TOOL_USE_LINE = _assistant_line({"type": "tool_use", "name": "Read"})
+_THINKING_LINE = _assistant_line({"type": "thinking", "text": "Let me think..."})
+_MULTI_BLOCK_LINE = _assistant_line(
+    {"type": "text", "text": "Part 1"},
+    {"type": "tool_use", "name": "Bash"},
+    {"type": "text", "text": "Part 2"},
+)
 
-def test_non_init_system_event_ignored() -> None:
-    data = {"type": "system", "subtype": "other"}
-    assert parse_stream_line(json.dumps(data)) == []
+# -- parse_stream_line --
 
 
-def test_result_event_defaults() -> None:
-    data = {"type": "result"}
-    events = parse_stream_line(json.dumps(data))
-    assert len(events) == 1
-    event = events[0]
-    assert isinstance(event, ResultEvent)
-    assert event.result == ""
-    assert event.is_error is False
-    assert event.session_id is None
+@pytest.mark.parametrize(
+    "line",
+    ["", "   ", "not json", _EMPTY_TEXT_LINE, _UNKNOWN_TYPE_LINE, _SYSTEM_OTHER_LINE],
+    ids=["empty", "whitespace", "invalid_json", "empty_text", "unknown_type", "non_init_system"],
+)
+def test_parse_returns_empty(line: str) -> None:
+    assert parse_stream_line(line) == []
+
+
+@pytest.mark.parametrize(
+    ("line", "event_types", "attrs"),
+    [
+        (
+            _RESULT_LINE,
+            (ResultEvent,),
+            {
+                "session_id": "abc-123",
+                "result": "Done.",
+                "is_error": False,
+                "total_cost_usd": 0.05,
+                "num_turns": 3,
+            },
+        ),
+        (_RESULT_BARE_LINE, (ResultEvent,), {"result": "", "is_error": False, "session_id": None}),
+        (_SYSTEM_INIT_LINE, (SystemInitEvent,), {"session_id": "sess-1"}),
+        (_TEXT_LINE, (AssistantTextDelta,), {"text": "Hello world"}),
+        (_TOOL_USE_LINE, (ToolUseEvent,), {"tool_name": "Read"}),
+        (_THINKING_LINE, (ThinkingEvent,), {"text": "Let me think..."}),
+        (
+            _MULTI_BLOCK_LINE,
+            (AssistantTextDelta, ToolUseEvent, AssistantTextDelta),
+            {"text": "Part 1"},
+        ),
+    ],
+    ids=[
+        "result",
+        "result_defaults",
+        "system_init",
+        "assistant_text",
+        "assistant_tool_use",
+        "assistant_thinking",
+        "multiple_content_blocks",
+    ],
+)
+def test_parse_events(
+    line: str, event_types: tuple[type[StreamEvent], ...], attrs: dict[str, Any]
+) -> None:
+    """*event_types* is the exact event sequence; *attrs* are checked on the first event."""
+    events = parse_stream_line(line)
+    assert tuple(type(e) for e in events) == event_types
+    for name, value in attrs.items():
+        assert getattr(events[0], name) == value
 
 
 # -- StreamEvent base --
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import dataclasses
+
+import pytest
+
 from ductor_bot.cli.types import AgentRequest, AgentResponse, CLIResponse
 
 # -- CLIResponse --
@@ -16,26 +20,23 @@ def test_cli_response_defaults() -> None:
     assert r.usage == {}
 
 
-def test_cli_response_input_tokens() -> None:
-    r = CLIResponse(usage={"input_tokens": 500})
-    assert r.input_tokens == 500
-
-
-def test_cli_response_output_tokens() -> None:
-    r = CLIResponse(usage={"output_tokens": 200})
-    assert r.output_tokens == 200
-
-
-def test_cli_response_total_tokens() -> None:
-    r = CLIResponse(usage={"input_tokens": 500, "output_tokens": 200})
-    assert r.total_tokens == 700
-
-
-def test_cli_response_empty_usage_returns_zero() -> None:
-    r = CLIResponse()
-    assert r.input_tokens == 0
-    assert r.output_tokens == 0
-    assert r.total_tokens == 0
+@pytest.mark.parametrize(
+    ("usage", "input_tokens", "output_tokens", "total_tokens"),
+    [
+        ({}, 0, 0, 0),
+        ({"input_tokens": 500}, 500, 0, 500),
+        ({"output_tokens": 200}, 0, 200, 200),
+        ({"input_tokens": 500, "output_tokens": 200}, 500, 200, 700),
+    ],
+    ids=["empty", "input_only", "output_only", "both"],
+)
+def test_cli_response_token_counts(
+    usage: dict[str, int], input_tokens: int, output_tokens: int, total_tokens: int
+) -> None:
+    r = CLIResponse(usage=usage)
+    assert r.input_tokens == input_tokens
+    assert r.output_tokens == output_tokens
+    assert r.total_tokens == total_tokens
 
 
 # -- AgentRequest --
@@ -57,13 +58,8 @@ def test_agent_request_defaults() -> None:
 
 def test_agent_request_is_frozen() -> None:
     req = AgentRequest(prompt="hello")
-    try:
+    with pytest.raises(dataclasses.FrozenInstanceError):
         req.prompt = "changed"  # type: ignore[misc]
-    except AttributeError:
-        pass
-    else:
-        msg = "AgentRequest should be frozen"
-        raise AssertionError(msg)
 
 
 def test_agent_request_with_overrides() -> None:
@@ -97,13 +93,8 @@ def test_agent_response_defaults() -> None:
 
 def test_agent_response_is_frozen() -> None:
     resp = AgentResponse(result="done")
-    try:
+    with pytest.raises(dataclasses.FrozenInstanceError):
         resp.result = "changed"  # type: ignore[misc]
-    except AttributeError:
-        pass
-    else:
-        msg = "AgentResponse should be frozen"
-        raise AssertionError(msg)
 
 
 def test_agent_response_with_values() -> None:
@@ -2,16 +2,14 @@
 
 from __future__ import annotations
 
-import json
-from pathlib import Path
-
 from ductor_bot.config import AgentConfig, deep_merge_config
 
+# deep_merge_config never mutates *defaults*, so every test shares one dump.
+_DEFAULTS = AgentConfig().model_dump()
 
-def test_old_config_loads_with_new_defaults(tmp_path: Path) -> None:
-    """Old config.json without cli_parameters should load successfully."""
-    config_path = tmp_path / "config.json"
 
+def test_old_config_loads_with_new_defaults() -> None:
+    """Old config.json without cli_parameters should load successfully."""
     # Simulate old config file from v0.3.3 (without cli_parameters)
     old_config = {
         "log_level": "DEBUG",
@@ -25,12 +23,8 @@ def test_old_config_loads_with_new_defaults(tmp_path: Path) -> None:
         },
     }
 
-    config_path.write_text(json.dumps(old_config, indent=2))
-
-    # Load and merge with defaults (simulating startup)
-    loaded_data = json.loads(config_path.read_text())
-    defaults = AgentConfig().model_dump()
-    merged, changed = deep_merge_config(loaded_data, defaults)
+    # Merge with defaults (simulating startup)
+    merged, changed = deep_merge_config(old_config, _DEFAULTS)
 
     # Should have added cli_parameters
     assert changed is True
@@ -51,10 +45,8 @@ def test_old_config_loads_with_new_defaults(tmp_path: Path) -> None:
     assert config.cli_parameters.codex == []
 
 
-def test_partial_cli_parameters_gets_completed(tmp_path: Path) -> None:
+def test_partial_cli_parameters_gets_completed() -> None:
     """Config with only partial cli_parameters should be completed."""
-    config_path = tmp_path / "config.json"
-
     # Config with only claude parameters (maybe manually edited)
     partial_config = {
         "provider": "codex",
@@ -63,11 +55,7 @@ def test_partial_cli_parameters_gets_completed(tmp_path: Path) -> None:
         },
     }
 
-    config_path.write_text(json.dumps(partial_config, indent=2))
-
-    loaded_data = json.loads(config_path.read_text())
-    defaults = AgentConfig().model_dump()
-    merged, changed = deep_merge_config(loaded_data, defaults)
+    merged, changed = deep_merge_config(partial_config, _DEFAULTS)
 
     # Should add missing codex key
     assert changed is True
@@ -81,10 +69,8 @@ def test_partial_cli_parameters_gets_completed(tmp_path: Path) -> None:
     assert config.cli_parameters.codex == []
 
 
-def test_config_with_all_new_fields_needs_no_merge(tmp_path: Path) -> None:
+def test_config_with_all_new_fields_needs_no_merge() -> None:
     """Config with all new fields should not trigger changes."""
-    config_path = tmp_path / "config.json"
-
     # Complete config with new fields
     complete_config = {
         "log_level": "INFO",
@@ -98,11 +84,7 @@ def test_config_with_all_new_fields_needs_no_merge(tmp_path: Path) -> None:
         "allowed_user_ids": [12345],
     }
 
-    config_path.write_text(json.dumps(complete_config, indent=2))
-
-    loaded_data = json.loads(config_path.read_text())
-    defaults = AgentConfig().model_dump()
-    merged, _changed = deep_merge_config(loaded_data, defaults)
+    merged, _changed = deep_merge_config(complete_config, _DEFAULTS)
 
     # Should add missing top-level keys but not change cli_parameters
     # _changed will be True because of missing top-level fields
@@ -128,8 +110,7 @@ def test_deeply_nested_defaults_merge_correctly() -> None:
         },
     }
 
-    defaults = AgentConfig().model_dump()
-    merged, changed = deep_merge_config(user_config, defaults)
+    merged, changed = deep_merge_config(user_config, _DEFAULTS)
 
     assert changed is True
 
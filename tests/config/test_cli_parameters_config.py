@@ -7,6 +7,9 @@ from pathlib import Path
 
 from ductor_bot.config import AgentConfig, CLIParametersConfig, deep_merge_config
 
+# Read-only: deep_merge_config copies from its defaults argument, never into it.
+_DEFAULTS = AgentConfig().model_dump()
+
 
 def test_cli_parameters_config_defaults() -> None:
     """CLIParametersConfig should have empty lists as defaults."""
@@ -55,13 +58,7 @@ def test_agent_config_json_round_trip_with_cli_parameters() -> None:
         ),
     )
 
-    # Serialize
-    data = original.model_dump()
-    json_str = json.dumps(data)
-
-    # Deserialize
-    parsed_data = json.loads(json_str)
-    restored = AgentConfig(**parsed_data)
+    restored = AgentConfig.model_validate_json(original.model_dump_json())
 
     assert restored.cli_parameters.claude == ["--fast", "--no-cache"]
     assert restored.cli_parameters.codex == ["--verbose"]
@@ -76,9 +73,7 @@ def test_deep_merge_preserves_cli_parameters() -> None:
         },
     }
 
-    defaults = AgentConfig().model_dump()
-
-    merged, _changed = deep_merge_config(user_config, defaults)
+    merged, _changed = deep_merge_config(user_config, _DEFAULTS)
 
     # User values should be preserved
     assert merged["cli_parameters"]["claude"] == ["--fast"]
@@ -98,8 +93,7 @@ def test_backward_compatibility_without_cli_parameters() -> None:
     }
 
     # Merge with defaults
-    defaults = AgentConfig().model_dump()
-    merged, changed = deep_merge_config(old_config_dict, defaults)
+    merged, changed = deep_merge_config(old_config_dict, _DEFAULTS)
 
     # Should add cli_parameters with defaults
     assert "cli_parameters" in merged
@@ -121,9 +115,7 @@ def test_deep_merge_nested_cli_parameters() -> None:
         },
     }
 
-    defaults = AgentConfig().model_dump()
-
-    merged, changed = deep_merge_config(user_config, defaults)
+    merged, changed = deep_merge_config(user_config, _DEFAULTS)
 
     # User's claude should be preserved
     assert merged["cli_parameters"]["claude"] == ["--fast"]
@@ -171,8 +163,7 @@ def test_empty_cli_parameters_list_vs_none() -> None:
         ),
     )
 
-    data = config.model_dump()
-    restored = AgentConfig(**data)
+    restored = AgentConfig.model_validate_json(config.model_dump_json())
 
     # Empty lists should remain empty lists, not None
     assert restored.cli_parameters.claude == []
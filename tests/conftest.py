@@ -3,9 +3,27 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
 
+from ductor_bot.cron import execution as cron_execution
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is optional
+    uvloop = None
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable
+
+
+@pytest.fixture(autouse=True)
+def _reset_cron_cli_paths(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give each test an empty cron CLI-path cache so patched ``which`` calls are honoured."""
+    monkeypatch.setattr(cron_execution, "_cli_paths", {})
+
 
 @pytest.fixture
 def tmp_ductor_home(tmp_path: Path) -> Path:
@@ -21,3 +39,26 @@ def tmp_workspace(tmp_ductor_home: Path) -> Path:
     ws = tmp_ductor_home / "workspace"
     ws.mkdir()
     return ws
+
+
+if uvloop is not None:
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(
+        config: pytest.Config,  # noqa: ARG001
+        item: pytest.Item,  # noqa: ARG001
+    ) -> dict[str, Callable[[], asyncio.AbstractEventLoop]]:
+        """Run async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Pin each test module to a single xdist worker.
+
+    With ``pytest -n auto --dist=loadgroup`` every module then pays its import and
+    module-scoped fixture cost once instead of once per worker it lands on.
+    """
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(item.nodeid.partition("::")[0]))
@@ -0,0 +1,145 @@
+"""Shared fixtures for cron tests: in-process runner for the cron_tools scripts."""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+CRON_TOOLS_DIR = (
+    Path(__file__).resolve().parents[2]
+    / "ductor_bot"
+    / "_home_defaults"
+    / "workspace"
+    / "tools"
+    / "cron_tools"
+)
+
+SEEDED_JOB = "seeded-job"
+
+# Snapshot once; spawn_tool only varies DUCTOR_HOME.
+_BASE_ENV = dict(os.environ)
+
+ToolRunner = Callable[[str, list[str]], subprocess.CompletedProcess[str]]
+
+
+def _load(name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(
+        f"cron_tools.{name}", CRON_TOOLS_DIR / f"{name}.py"
+    )
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# The scripts do ``from _shared import ...``; expose it only while loading them.
+_SHARED = _load("_shared")
+with patch.dict(sys.modules, {"_shared": _SHARED}):
+    TOOLS: dict[str, ModuleType] = {
+        name: _load(name) for name in ("cron_add", "cron_edit", "cron_remove")
+    }
+
+
+def read_jobs(home: Path) -> dict[str, dict[str, Any]]:
+    """Parse *home*/cron_jobs.json once and index the jobs by id."""
+    data = json.loads((home / "cron_jobs.json").read_text(encoding="utf-8"))
+    return {job["id"]: job for job in data["jobs"]}
+
+
+def spawn_tool(home: Path, tool: str, args: list[str]) -> subprocess.CompletedProcess[bytes]:
+    """Run a cron tool as a real subprocess (exercises the ``__main__`` entry).
+
+    Output stays as bytes; ``json.loads`` accepts them without a decode step.
+    """
+    env = _BASE_ENV | {"DUCTOR_HOME": str(home)}
+    return subprocess.run(
+        [sys.executable, str(CRON_TOOLS_DIR / f"{tool}.py"), *args],
+        capture_output=True,
+        env=env,
+        check=False,
+    )
+
+
+def _point_tools_at(mp: pytest.MonkeyPatch, home: Path) -> None:
+    """Repoint the import-time paths from ``_shared`` (and its by-name copies) at *home*."""
+    jobs_path = home / "cron_jobs.json"
+    tasks_dir = home / "workspace" / "cron_tasks"
+    mp.setenv("DUCTOR_HOME", str(home))
+    mp.setattr(_SHARED, "DUCTOR_HOME", home)
+    mp.setattr(_SHARED, "CONFIG_PATH", home / "config" / "config.json")
+    for module in (_SHARED, *TOOLS.values()):
+        mp.setattr(module, "JOBS_PATH", jobs_path)
+        mp.setattr(module, "CRON_TASKS_DIR", tasks_dir)
+
+
+def _call_main(tool: str, args: list[str]) -> int:
+    try:
+        TOOLS[tool].main(args)
+    except SystemExit as exc:
+        code = exc.code
+        return code if isinstance(code, int) else int(code is not None)
+    return 0
+
+
+@pytest.fixture
+def run_tool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> ToolRunner:
+    """Call a cron tool's ``main()`` in-process with DUCTOR_HOME set to *tmp_path*."""
+    _point_tools_at(monkeypatch, tmp_path)
+
+    def _run(tool: str, args: list[str]) -> subprocess.CompletedProcess[str]:
+        capsys.readouterr()
+        returncode = _call_main(tool, args)
+        out, err = capsys.readouterr()
+        return subprocess.CompletedProcess([tool, *args], returncode, out, err)
+
+    return _run
+
+
+@pytest.fixture(scope="session")
+def prebuilt_job_home(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A DUCTOR_HOME holding one job (SEEDED_JOB) created by cron_add, built once."""
+    home = tmp_path_factory.mktemp("prebuilt_job_home")
+    with pytest.MonkeyPatch.context() as mp, contextlib.redirect_stdout(io.StringIO()):
+        _point_tools_at(mp, home)
+        returncode = _call_main(
+            "cron_add",
+            [
+                "--name",
+                SEEDED_JOB,
+                "--title",
+                "Seeded Job",
+                "--description",
+                "Original description",
+                "--schedule",
+                "0 9 * * *",
+            ],
+        )
+    assert returncode == 0
+    return home
+
+
+@pytest.fixture
+def seeded_home(tmp_path: Path, prebuilt_job_home: Path) -> Path:
+    """Copy the prebuilt home into *tmp_path* (the home ``run_tool`` points at).
+
+    Files are copied rather than hardlinked: the tools rewrite cron_jobs.json and
+    CLAUDE.md in place, which would leak through shared inodes into other tests.
+    """
+    shutil.copytree(prebuilt_job_home, tmp_path, dirs_exist_ok=True)
+    return tmp_path
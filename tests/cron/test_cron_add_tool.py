@@ -1,33 +1,17 @@
-"""Tests for the cron_add.py CLI tool (subprocess-based)."""
+"""Tests for the cron_add.py CLI tool."""
 
 from __future__ import annotations
 
 import json
-import os
-import subprocess
-import sys
-from pathlib import Path
-
-TOOL_PATH = (
-    Path(__file__).resolve().parents[2]
-    / "ductor_bot"
-    / "_home_defaults"
-    / "workspace"
-    / "tools"
-    / "cron_tools"
-    / "cron_add.py"
-)
-
-
-def _run_tool(tmp_path: Path, args: list[str]) -> subprocess.CompletedProcess[str]:
-    env = {**os.environ, "DUCTOR_HOME": str(tmp_path)}
-    return subprocess.run(
-        [sys.executable, str(TOOL_PATH), *args],
-        capture_output=True,
-        text=True,
-        env=env,
-        check=False,
-    )
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from tests.cron.conftest import read_jobs, spawn_tool
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.cron.conftest import ToolRunner
 
 
 def _full_args(name: str = "test-job") -> list[str]:
@@ -43,21 +27,40 @@ def _full_args(name: str = "test-job") -> list[str]:
     ]
 
 
-def test_cron_add_creates_json_and_folder(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, _full_args("my-job"))
-    assert result.returncode == 0
+@dataclass(frozen=True, slots=True)
+class _AddResult:
+    """One cron_add run: exit code, parsed stdout, resulting jobs and task folder."""
+
+    returncode: int
+    output: dict[str, Any]
+    jobs: dict[str, dict[str, Any]]
+    task_dir: Path
 
+
+def _add(run_tool: ToolRunner, home: Path, name: str) -> _AddResult:
+    result = run_tool("cron_add", _full_args(name))
     output = json.loads(result.stdout)
-    assert output["job_id"] == "my-job"
-    assert output["folder_created"] is True
-    assert output["json_entry_created"] is True
+    return _AddResult(
+        returncode=result.returncode,
+        output=output,
+        jobs=read_jobs(home),
+        task_dir=home / "workspace" / "cron_tasks" / output.get("job_id", name),
+    )
+
+
+def test_cron_add_creates_json_and_folder(tmp_path: Path, run_tool: ToolRunner) -> None:
+    added = _add(run_tool, tmp_path, "my-job")
+    assert added.returncode == 0
+
+    assert added.output["job_id"] == "my-job"
+    assert added.output["folder_created"] is True
+    assert added.output["json_entry_created"] is True
 
     # JSON entry exists
-    data = json.loads((tmp_path / "cron_jobs.json").read_text())
-    assert any(j["id"] == "my-job" for j in data["jobs"])
+    assert "my-job" in added.jobs
 
     # Folder structure exists
-    task_dir = tmp_path / "workspace" / "cron_tasks" / "my-job"
+    task_dir = added.task_dir
     assert task_dir.is_dir()
     assert (task_dir / "CLAUDE.md").exists()
     assert (task_dir / "AGENTS.md").exists()
@@ -66,72 +69,50 @@ def test_cron_add_creates_json_and_folder(tmp_path: Path) -> None:
     assert (task_dir / "scripts").is_dir()
 
 
-def test_cron_add_duplicate_exits_1(tmp_path: Path) -> None:
-    _run_tool(tmp_path, _full_args("dup"))
-    result = _run_tool(tmp_path, _full_args("dup"))
-    assert result.returncode == 1
-    output = json.loads(result.stdout)
-    assert "already exists" in output["error"]
-
-
-def test_cron_add_missing_params_shows_tutorial(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, ["--name", "incomplete"])
-    assert result.returncode == 1
-    assert "CRON ADD" in result.stdout
-    assert "CRON EXPRESSION FORMAT" in result.stdout
-    assert "Missing required parameters" in result.stdout
-
+def test_cron_add_duplicate_exits_1(tmp_path: Path, run_tool: ToolRunner) -> None:
+    _add(run_tool, tmp_path, "dup")
+    added = _add(run_tool, tmp_path, "dup")
+    assert added.returncode == 1
+    assert "already exists" in added.output["error"]
 
-def test_cron_add_no_args_shows_tutorial(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, [])
-    assert result.returncode == 1
-    assert "CRON ADD" in result.stdout
 
+def test_cron_add_sanitizes_name(tmp_path: Path, run_tool: ToolRunner) -> None:
+    added = _add(run_tool, tmp_path, "My Feature!!")
+    assert added.returncode == 0
+    assert added.output["job_id"] == "my-feature"
+    assert "my-feature" in added.jobs
 
-def test_cron_add_sanitizes_name(tmp_path: Path) -> None:
-    args = _full_args("My Feature!!")
-    result = _run_tool(tmp_path, args)
-    assert result.returncode == 0
-    output = json.loads(result.stdout)
-    assert output["job_id"] == "my-feature"
 
+def test_cron_add_writes_task_files(tmp_path: Path, run_tool: ToolRunner) -> None:
+    added = _add(run_tool, tmp_path, "files-test")
+    assert added.returncode == 0
+    files = {p.name: p.read_text() for p in added.task_dir.iterdir() if p.is_file()}
 
-def test_cron_add_claude_md_has_fixed_content(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, _full_args("rule-test"))
-    assert result.returncode == 0
-    task_dir = tmp_path / "workspace" / "cron_tasks" / "rule-test"
-    content = (task_dir / "CLAUDE.md").read_text()
-    assert "Your Mission" in content
-    assert "TASK_DESCRIPTION.md" in content
-    assert "automated agent" in content
+    claude = files["CLAUDE.md"]
+    assert "Your Mission" in claude
+    assert "TASK_DESCRIPTION.md" in claude
+    assert "automated agent" in claude
     # Description should NOT be in CLAUDE.md (it's in TASK_DESCRIPTION.md)
-    assert "A test cron job" not in content
+    assert "A test cron job" not in claude
+    assert files["AGENTS.md"] == claude
 
-
-def test_cron_add_creates_task_description(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, _full_args("desc-test"))
-    assert result.returncode == 0
-    task_dir = tmp_path / "workspace" / "cron_tasks" / "desc-test"
-    content = (task_dir / "TASK_DESCRIPTION.md").read_text()
-    assert "A test cron job" in content
-    assert "Test Job" in content
-    assert "## Assignment" in content
-    assert "## Output" in content
+    task_desc = files["TASK_DESCRIPTION.md"]
+    assert "A test cron job" in task_desc
+    assert "Test Job" in task_desc
+    assert "## Assignment" in task_desc
+    assert "## Output" in task_desc
 
 
-def test_cron_add_json_has_fixed_instruction(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, _full_args("instr-test"))
-    assert result.returncode == 0
-    data = json.loads((tmp_path / "cron_jobs.json").read_text())
-    job = next(j for j in data["jobs"] if j["id"] == "instr-test")
-    assert "TASK_DESCRIPTION.md" in job["agent_instruction"]
+def test_cron_add_json_has_fixed_instruction(tmp_path: Path, run_tool: ToolRunner) -> None:
+    added = _add(run_tool, tmp_path, "instr-test")
+    assert added.returncode == 0
+    assert "TASK_DESCRIPTION.md" in added.jobs["instr-test"]["agent_instruction"]
 
 
-def test_cron_add_output_includes_action_required(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, _full_args("step-test"))
-    assert result.returncode == 0
-    output = json.loads(result.stdout)
-    actions = output["action_required"]
+def test_cron_add_output_includes_action_required(tmp_path: Path, run_tool: ToolRunner) -> None:
+    added = _add(run_tool, tmp_path, "step-test")
+    assert added.returncode == 0
+    actions = added.output["action_required"]
     assert isinstance(actions, list)
     assert len(actions) >= 3
     joined = " ".join(actions)
@@ -140,15 +121,14 @@ def test_cron_add_output_includes_action_required(tmp_path: Path) -> None:
     assert "step-test_MEMORY.md" in joined
 
 
-def test_cron_add_agents_md_mirrors_claude_md(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, _full_args("mirror-test"))
-    assert result.returncode == 0
-    task_dir = tmp_path / "workspace" / "cron_tasks" / "mirror-test"
-    assert (task_dir / "CLAUDE.md").read_text() == (task_dir / "AGENTS.md").read_text()
+def test_cron_add_no_venv_by_default(tmp_path: Path, run_tool: ToolRunner) -> None:
+    added = _add(run_tool, tmp_path, "venv-test")
+    assert added.returncode == 0
+    assert not (added.task_dir / ".venv").exists()
 
 
-def test_cron_add_no_venv_by_default(tmp_path: Path) -> None:
-    result = _run_tool(tmp_path, _full_args("venv-test"))
+def test_cron_add_subprocess_smoke(tmp_path: Path) -> None:
+    result = spawn_tool(tmp_path, "cron_add", _full_args("smoke"))
     assert result.returncode == 0
-    task_dir = tmp_path / "workspace" / "cron_tasks" / "venv-test"
-    assert not (task_dir / ".venv").exists()
+    assert json.loads(result.stdout)["job_id"] == "smoke"
+    assert (tmp_path / "workspace" / "cron_tasks" / "smoke").is_dir()
@@ -1,76 +1,26 @@
-"""Tests for the cron_edit.py CLI tool (subprocess-based)."""
+"""Tests for the cron_edit.py CLI tool."""
 
 from __future__ import annotations
 
 import json
-import os
-import subprocess
-import sys
-from pathlib import Path
-from typing import Any
-
-TOOL_ADD = (
-    Path(__file__).resolve().parents[2]
-    / "ductor_bot"
-    / "_home_defaults"
-    / "workspace"
-    / "tools"
-    / "cron_tools"
-    / "cron_add.py"
-)
-TOOL_EDIT = (
-    Path(__file__).resolve().parents[2]
-    / "ductor_bot"
-    / "_home_defaults"
-    / "workspace"
-    / "tools"
-    / "cron_tools"
-    / "cron_edit.py"
-)
-
-
-def _run(tmp_path: Path, tool: Path, args: list[str]) -> subprocess.CompletedProcess[str]:
-    env = {**os.environ, "DUCTOR_HOME": str(tmp_path)}
-    return subprocess.run(
-        [sys.executable, str(tool), *args],
-        capture_output=True,
-        text=True,
-        env=env,
-        check=False,
-    )
-
+from typing import TYPE_CHECKING
 
-def _add_job(tmp_path: Path, name: str = "edit-test") -> None:
-    result = _run(
-        tmp_path,
-        TOOL_ADD,
-        [
-            "--name",
-            name,
-            "--title",
-            "Edit Test",
-            "--description",
-            "Original description",
-            "--schedule",
-            "0 9 * * *",
-        ],
-    )
-    assert result.returncode == 0
+import pytest
 
+from tests.cron.conftest import SEEDED_JOB, read_jobs, spawn_tool
 
-def _job(tmp_path: Path, job_id: str) -> dict[str, Any]:
-    data = json.loads((tmp_path / "cron_jobs.json").read_text())
-    return next(j for j in data["jobs"] if j["id"] == job_id)
+if TYPE_CHECKING:
+    from pathlib import Path
 
+    from tests.cron.conftest import ToolRunner
 
-def test_cron_edit_updates_title_description_schedule(tmp_path: Path) -> None:
-    _add_job(tmp_path, "meta-job")
 
-    result = _run(
-        tmp_path,
-        TOOL_EDIT,
+@pytest.mark.usefixtures("seeded_home")
+def test_cron_edit_updates_title_description_schedule(tmp_path: Path, run_tool: ToolRunner) -> None:
+    result = run_tool(
+        "cron_edit",
         [
-            "meta-job",
+            SEEDED_JOB,
             "--title",
             "Meta Job Updated",
             "--description",
@@ -86,18 +36,18 @@ def test_cron_edit_updates_title_description_schedule(tmp_path: Path) -> None:
     assert "description" in output["updated_fields"]
     assert "schedule" in output["updated_fields"]
 
-    job = _job(tmp_path, "meta-job")
+    job = read_jobs(tmp_path)[SEEDED_JOB]
     assert job["title"] == "Meta Job Updated"
     assert job["description"] == "New description"
     assert job["schedule"] == "30 7 * * 1-5"
 
 
-def test_cron_edit_rename_updates_json_and_folder(tmp_path: Path) -> None:
-    _add_job(tmp_path, "old-name")
-    old_dir = tmp_path / "workspace" / "cron_tasks" / "old-name"
-    assert (old_dir / "old-name_MEMORY.md").exists()
+@pytest.mark.usefixtures("seeded_home")
+def test_cron_edit_rename_updates_json_and_folder(tmp_path: Path, run_tool: ToolRunner) -> None:
+    old_dir = tmp_path / "workspace" / "cron_tasks" / SEEDED_JOB
+    assert (old_dir / f"{SEEDED_JOB}_MEMORY.md").exists()
 
-    result = _run(tmp_path, TOOL_EDIT, ["old-name", "--name", "new-name"])
+    result = run_tool("cron_edit", [SEEDED_JOB, "--name", "new-name"])
     assert result.returncode == 0
     output = json.loads(result.stdout)
     assert output["job_id"] == "new-name"
@@ -106,8 +56,9 @@ def test_cron_edit_rename_updates_json_and_folder(tmp_path: Path) -> None:
     assert "id" in output["updated_fields"]
     assert "task_folder" in output["updated_fields"]
 
-    data = json.loads((tmp_path / "cron_jobs.json").read_text())
-    assert any(j["id"] == "new-name" and j["task_folder"] == "new-name" for j in data["jobs"])
+    jobs = read_jobs(tmp_path)
+    assert SEEDED_JOB not in jobs
+    assert jobs["new-name"]["task_folder"] == "new-name"
     assert not old_dir.exists()
 
     new_dir = tmp_path / "workspace" / "cron_tasks" / "new-name"
@@ -119,29 +70,20 @@ def test_cron_edit_rename_updates_json_and_folder(tmp_path: Path) -> None:
     assert agents == claude
 
 
-def test_cron_edit_disable_then_enable(tmp_path: Path) -> None:
-    _add_job(tmp_path, "toggle-job")
-
-    disabled = _run(tmp_path, TOOL_EDIT, ["toggle-job", "--disable"])
+@pytest.mark.usefixtures("seeded_home")
+def test_cron_edit_disable_then_enable(tmp_path: Path, run_tool: ToolRunner) -> None:
+    disabled = run_tool("cron_edit", [SEEDED_JOB, "--disable"])
     assert disabled.returncode == 0
-    assert _job(tmp_path, "toggle-job")["enabled"] is False
+    assert read_jobs(tmp_path)[SEEDED_JOB]["enabled"] is False
 
-    enabled = _run(tmp_path, TOOL_EDIT, ["toggle-job", "--enable"])
+    enabled = run_tool("cron_edit", [SEEDED_JOB, "--enable"])
     assert enabled.returncode == 0
-    assert _job(tmp_path, "toggle-job")["enabled"] is True
-
+    assert read_jobs(tmp_path)[SEEDED_JOB]["enabled"] is True
 
-def test_cron_edit_no_change_flags_exits_1(tmp_path: Path) -> None:
-    _add_job(tmp_path, "no-change")
-    result = _run(tmp_path, TOOL_EDIT, ["no-change"])
-    assert result.returncode == 1
-    assert "CRON EDIT" in result.stdout
-    assert "Missing changes" in result.stdout
 
-
-def test_cron_edit_nonexistent_exits_1(tmp_path: Path) -> None:
-    (tmp_path / "cron_jobs.json").write_text('{"jobs": []}')
-    result = _run(tmp_path, TOOL_EDIT, ["ghost", "--title", "x"])
-    assert result.returncode == 1
-    output = json.loads(result.stdout)
-    assert "not found" in output["error"]
+@pytest.mark.usefixtures("seeded_home")
+def test_cron_edit_subprocess_smoke(tmp_path: Path) -> None:
+    result = spawn_tool(tmp_path, "cron_edit", [SEEDED_JOB, "--disable"])
+    assert result.returncode == 0
+    assert json.loads(result.stdout)["updated"] is True
+    assert read_jobs(tmp_path)[SEEDED_JOB]["enabled"] is False
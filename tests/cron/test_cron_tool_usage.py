@@ -0,0 +1,43 @@
+"""Tests for the usage/error exits shared by the cron_add, cron_edit and cron_remove tools."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tests.cron.conftest import SEEDED_JOB
+
+if TYPE_CHECKING:
+    from tests.cron.conftest import ToolRunner
+
+
+@pytest.mark.usefixtures("seeded_home")
+@pytest.mark.parametrize(
+    ("tool", "args", "expected"),
+    [
+        (
+            "cron_add",
+            ["--name", "incomplete"],
+            ("CRON ADD", "CRON EXPRESSION FORMAT", "Missing required parameters"),
+        ),
+        ("cron_add", [], ("CRON ADD",)),
+        ("cron_edit", [SEEDED_JOB], ("CRON EDIT", "Missing changes")),
+        ("cron_edit", ["ghost", "--title", "x"], ("not found",)),
+        ("cron_remove", [], ("CRON REMOVE",)),
+    ],
+    ids=[
+        "add_missing_params",
+        "add_no_args",
+        "edit_no_change_flags",
+        "edit_nonexistent",
+        "remove_no_args",
+    ],
+)
+def test_bad_input_exits_1(
+    run_tool: ToolRunner, tool: str, args: list[str], expected: tuple[str, ...]
+) -> None:
+    result = run_tool(tool, args)
+    assert result.returncode == 1
+    for text in expected:
+        assert text in result.stdout
@@ -7,6 +7,12 @@ import contextlib
 
 from ductor_bot.cron.dependency_queue import DependencyQueue
 
+
+def _gate() -> asyncio.Future[None]:
+    """One-shot phase gate: ``gate.set_result(None)`` releases every ``await gate``."""
+    return asyncio.get_running_loop().create_future()
+
+
 # ---------------------------------------------------------------------------
 # No dependency runs immediately
 # ---------------------------------------------------------------------------
@@ -29,12 +35,10 @@ async def test_no_dependency_parallel() -> None:
     """Multiple tasks with dependency=None run concurrently."""
     dq = DependencyQueue()
     order: list[str] = []
-    barrier = asyncio.Event()
 
     async def task(name: str) -> None:
         async with dq.acquire(name, name, None):
             order.append(f"{name}_start")
-            barrier.set()
             await asyncio.sleep(0)
             order.append(f"{name}_end")
 
@@ -55,18 +59,18 @@ async def test_same_dependency_fifo_order() -> None:
     """Three tasks with the same dependency run sequentially in FIFO order."""
     dq = DependencyQueue()
     order: list[str] = []
-    gate = asyncio.Event()
+    gate = _gate()
 
     async def task(name: str, wait_for_gate: bool = False) -> None:
         async with dq.acquire(name, name, "shared"):
             if wait_for_gate:
-                gate.set()
+                gate.set_result(None)
             order.append(name)
             await asyncio.sleep(0.01)
 
     # Start task1 first, it acquires the lock
     t1 = asyncio.create_task(task("task1", wait_for_gate=True))
-    await gate.wait()
+    await gate
 
     # Queue task2 and task3 while task1 holds the lock
     t2 = asyncio.create_task(task("task2"))
@@ -81,17 +85,17 @@ async def test_same_dependency_blocks() -> None:
     dq = DependencyQueue()
     started: list[str] = []
     finished: list[str] = []
-    gate = asyncio.Event()
+    gate = _gate()
 
     async def slow_task() -> None:
         async with dq.acquire("slow", "Slow", "dep"):
             started.append("slow")
-            gate.set()
+            gate.set_result(None)
             await asyncio.sleep(0.05)
             finished.append("slow")
 
     async def fast_task() -> None:
-        await gate.wait()
+        await gate
         # Small delay to ensure slow_task has the lock
         await asyncio.sleep(0.01)
         async with dq.acquire("fast", "Fast", "dep"):
@@ -144,13 +148,13 @@ async def test_mixed_dependencies() -> None:
     """Tasks with same dependency are sequential; different ones are parallel."""
     dq = DependencyQueue()
     order: list[str] = []
-    gate_a1 = asyncio.Event()
+    gate_a1 = _gate()
 
-    async def task(name: str, dep: str | None, signal: asyncio.Event | None = None) -> None:
+    async def task(name: str, dep: str | None, signal: asyncio.Future[None] | None = None) -> None:
         async with dq.acquire(name, name, dep):
             order.append(f"{name}_start")
-            if signal:
-                signal.set()
+            if signal is not None:
+                signal.set_result(None)
             await asyncio.sleep(0.02)
             order.append(f"{name}_end")
 
@@ -158,7 +162,7 @@ async def test_mixed_dependencies() -> None:
     # b1 has "dep_b" -> parallel with dep_a tasks
     # c1 has None -> runs immediately
     t_a1 = asyncio.create_task(task("a1", "dep_a", signal=gate_a1))
-    await gate_a1.wait()
+    await gate_a1
 
     t_a2 = asyncio.create_task(task("a2", "dep_a"))
     t_b1 = asyncio.create_task(task("b1", "dep_b"))
@@ -181,16 +185,16 @@ async def test_mixed_dependencies() -> None:
 async def test_cancellation_releases_lock() -> None:
     """Cancelling a task releases the dependency lock for the next task."""
     dq = DependencyQueue()
-    gate = asyncio.Event()
+    gate = _gate()
     result: list[str] = []
 
     async def cancellable_task() -> None:
         async with dq.acquire("cancel_me", "Cancellable", "dep"):
-            gate.set()
+            gate.set_result(None)
             await asyncio.sleep(10)  # Will be cancelled
 
     async def waiting_task() -> None:
-        await gate.wait()
+        await gate
         await asyncio.sleep(0.01)
         async with dq.acquire("waiter", "Waiter", "dep"):
             result.append("waiter_done")
@@ -198,7 +202,7 @@ async def test_cancellation_releases_lock() -> None:
     t1 = asyncio.create_task(cancellable_task())
     t2 = asyncio.create_task(waiting_task())
 
-    await gate.wait()
+    await gate
     await asyncio.sleep(0.01)
     t1.cancel()
 
@@ -286,15 +290,15 @@ async def test_get_queue_info_empty() -> None:
 async def test_get_queue_info_active_task() -> None:
     """Queue info shows the currently active task while lock is held."""
     dq = DependencyQueue()
-    gate = asyncio.Event()
+    gate = _gate()
 
     async def holder() -> None:
         async with dq.acquire("h1", "Holder", "dep"):
-            gate.set()
+            gate.set_result(None)
             await asyncio.sleep(0.1)
 
     t = asyncio.create_task(holder())
-    await gate.wait()
+    await gate
 
     info = dq.get_queue_info("dep")
     assert info["locked"] is True
@@ -308,15 +312,15 @@ async def test_get_queue_info_active_task() -> None:
 async def test_get_queue_info_with_queued_tasks() -> None:
     """Queue info shows waiting tasks when lock is held."""
     dq = DependencyQueue()
-    gate = asyncio.Event()
+    gate = _gate()
 
     async def holder() -> None:
         async with dq.acquire("h1", "Holder", "dep"):
-            gate.set()
+            gate.set_result(None)
             await asyncio.sleep(0.5)
 
     async def waiter(name: str) -> None:
-        await gate.wait()
+        await gate
         await asyncio.sleep(0.01)
         async with dq.acquire(name, name, "dep"):
             pass
@@ -325,7 +329,7 @@ async def test_get_queue_info_with_queued_tasks() -> None:
     t2 = asyncio.create_task(waiter("W1"))
     t3 = asyncio.create_task(waiter("W2"))
 
-    await gate.wait()
+    await gate
     await asyncio.sleep(0.05)  # Let waiters enqueue
 
     info = dq.get_queue_info("dep")
@@ -344,13 +348,15 @@ async def test_get_queue_info_with_queued_tasks() -> None:
 
 
 async def test_get_all_dependencies() -> None:
-    """get_all_dependencies returns sorted list of known dependency names."""
+    """get_all_dependencies returns sorted, de-duplicated known dependency names."""
     dq = DependencyQueue()
 
     async with dq.acquire("t1", "T1", "beta"):
         pass
     async with dq.acquire("t2", "T2", "alpha"):
         pass
+    async with dq.acquire("t3", "T3", "beta"):
+        pass
 
     deps = dq.get_all_dependencies()
     assert deps == ["alpha", "beta"]
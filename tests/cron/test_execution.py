@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 from ductor_bot.cli.param_resolver import TaskExecutionConfig
@@ -13,6 +14,9 @@ from ductor_bot.cron.execution import (
     parse_codex_result,
 )
 
+if TYPE_CHECKING:
+    import pytest
+
 
 class TestBuildCmd:
     def test_claude_provider(self) -> None:
@@ -90,6 +94,44 @@ class TestBuildCmd:
         assert cmd is not None
         assert cmd[0] == "/usr/bin/claude"
 
+    def test_caches_found_cli(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        exec_config = TaskExecutionConfig(
+            provider="claude",
+            model="opus",
+            reasoning_effort="",
+            cli_parameters=[],
+            permission_mode="plan",
+            working_dir="/tmp",
+            file_access="all",
+        )
+        monkeypatch.setenv("PATH", "/usr/bin")
+        with patch("ductor_bot.cron.execution.which", return_value="/usr/bin/claude") as which:
+            build_cmd(exec_config, "one")
+            build_cmd(exec_config, "two")
+            assert which.call_count == 1
+
+            # A different $PATH is a different cache key
+            monkeypatch.setenv("PATH", "/opt/bin")
+            build_cmd(exec_config, "three")
+            assert which.call_count == 2
+
+    def test_does_not_cache_missing_cli(self) -> None:
+        exec_config = TaskExecutionConfig(
+            provider="claude",
+            model="opus",
+            reasoning_effort="",
+            cli_parameters=[],
+            permission_mode="plan",
+            working_dir="/tmp",
+            file_access="all",
+        )
+        with patch("ductor_bot.cron.execution.which", return_value=None):
+            assert build_cmd(exec_config, "hello") is None
+        with patch("ductor_bot.cron.execution.which", return_value="/usr/bin/claude"):
+            cmd = build_cmd(exec_config, "hello")
+        assert cmd is not None
+        assert cmd[0] == "/usr/bin/claude"
+
 
 class TestEnrichInstruction:
     def test_appends_memory_instructions(self) -> None:
@@ -117,6 +159,12 @@ class TestParseClaude:
         raw = b"Some raw text output"
         assert parse_claude_result(raw) == "Some raw text output"
 
+    def test_non_object_json_returns_raw(self) -> None:
+        assert parse_claude_result(b'["not", "an", "envelope"]') == '["not", "an", "envelope"]'
+
+    def test_invalid_json_object_returns_raw(self) -> None:
+        assert parse_claude_result(b'{"result": ') == '{"result":'
+
 
 class TestParseCodex:
     def test_empty_bytes(self) -> None:
@@ -130,3 +178,9 @@ class TestIndent:
 
     def test_single_line(self) -> None:
         assert indent("hello", ">> ") == ">> hello"
+
+    def test_drops_trailing_newline(self) -> None:
+        assert indent("a\nb\n", "  ") == "  a\n  b"
+
+    def test_empty(self) -> None:
+        assert indent("", "  ") == ""